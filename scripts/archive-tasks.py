@@ -1,82 +1,73 @@
 #!/usr/bin/env python3
 """Archive completed one-time tasks to completed/ folder."""
 
-import shutil
-import yaml
+import argparse
+import sys
 from pathlib import Path
 
-CONFIG_PATH = Path.home() / ".claude" / "task-management-config" / "config.yaml"
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
 
+from task_utils import count_archived, find_archived, migrate_archive, restore_archived
+from task_profile import add_profile_args, run_profiled
+from tasks import Session, add_vault_args, cmd_archive
 
-def load_config():
-    """Load configuration from config file."""
-    if not CONFIG_PATH.exists():
-        raise FileNotFoundError(f"Config file not found: {CONFIG_PATH}")
-    with open(CONFIG_PATH, 'r') as f:
-        return yaml.safe_load(f)
 
-
-def get_paths(config):
-    """Extract paths from config."""
-    vault_root = Path(config['paths']['vault_root']).expanduser()
-    folders = config.get('folders', {})
-
-    return {
-        'vault_root': vault_root,
-        'tasks': vault_root / folders.get('tasks', 'notes/tasks'),
-        'completed': vault_root / folders.get('completed', 'notes/tasks/completed'),
-    }
-
-
-def parse_frontmatter(content: str) -> dict:
-    """Parse YAML frontmatter from markdown content."""
-    if not content.startswith('---'):
-        return {}
-
-    parts = content.split('---', 2)
-    if len(parts) < 3:
-        return {}
-
-    try:
-        return yaml.safe_load(parts[1]) or {}
-    except yaml.YAMLError:
-        return {}
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--migrate', action='store_true',
+                       help='move a flat completed/ folder into YYYY/MM shards and rebuild the manifest')
+    group.add_argument('--find', metavar='NAME', help='show where an archived task is stored')
+    group.add_argument('--restore', metavar='NAME', help='move an archived task back to the tasks folder')
+    group.add_argument('--count', action='store_true', help='count archived tasks per month')
+    add_vault_args(parser, several=False)
+    add_profile_args(parser)
+    return parser.parse_args()
 
 
 def main():
-    config = load_config()
-    paths = get_paths(config)
+    args = parse_args()
+    session = Session(options=args)
+    paths = session.paths
 
     tasks_dir = paths['tasks']
     completed_dir = paths['completed']
 
-    if not tasks_dir.exists():
-        print("No tasks folder found.")
+    if args.migrate:
+        stats = migrate_archive(completed_dir)
+        print(f"Moved {stats['moved']} task(s) into completed/YYYY/MM/")
+        print(f"Indexed {stats['indexed']} already-sharded task(s)")
+        if stats['undated']:
+            print(f"Left {stats['undated']} task(s) without a completed date in completed/")
         return
 
-    completed_dir.mkdir(parents=True, exist_ok=True)
-
-    archived = []
-
-    for task_file in tasks_dir.glob('*.md'):
-        content = task_file.read_text()
-        frontmatter = parse_frontmatter(content)
+    if args.find:
+        matches = find_archived(completed_dir, args.find)
+        if not matches:
+            print(f"No archived task named {args.find}.")
+            sys.exit(1)
+        for match in matches:
+            print(match.relative_to(paths['vault_root']))
+        return
 
-        has_completed = frontmatter.get('completed') is not None
-        has_recurrence = frontmatter.get('recurrence') is not None
+    if args.restore:
+        try:
+            dest = restore_archived(completed_dir, tasks_dir, args.restore)
+        except (FileNotFoundError, FileExistsError) as e:
+            print(e)
+            sys.exit(1)
+        print(f"Restored [[{dest.stem}]] to {dest.relative_to(paths['vault_root'])}")
+        return
 
-        # Only archive if completed and NOT recurring
-        if has_completed and not has_recurrence:
-            dest = completed_dir / task_file.name
-            shutil.move(str(task_file), str(dest))
-            archived.append(task_file.stem)
+    if args.count:
+        counts = count_archived(completed_dir)
+        for month, count in sorted(counts.items()):
+            print(f"- {month}: {count}")
+        print(f"Total: {sum(counts.values())} archived task(s)")
+        return
 
-    if archived:
-        print(f"Archived {len(archived)} task(s) to completed/:")
-        for name in archived:
-            print(f"- [[{name}]]")
-    else:
-        print("No completed tasks to archive.")
+    run_profiled(args, lambda: cmd_archive(session))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""Benchmark scan, render, sync and archive against a synthetic vault.
+
+Builds a deterministic vault (same options and seed give the same files),
+times each phase, and optionally writes the results as JSON and compares
+them against a saved baseline.
+
+Example:
+    benchmark.py --tasks 10000 --output bench.json
+    benchmark.py --tasks 10000 --baseline bench.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from task_utils import (
+    WRITE_STATS, get_paths, scan_tasks, parse_date_string, generate_today_md, generate_this_week_md,
+    generate_next_week_md, sync_to_daily_note, sync_to_weekly_note, archive_completed_tasks,
+)
+
+RESULTS_VERSION = 1
+
+# Differences smaller than this (seconds) are timer noise, never regressions
+NOISE_FLOOR = 0.001
+
+RECURRENCES = ['weekly', 'biweekly', 'monthly', 'quarterly', 'yearly']
+
+DATE_WRITERS = {
+    'iso': lambda d: d.strftime('%Y-%m-%d'),
+    'iso-unpadded': lambda d: f"{d.year}-{d.month}-{d.day}",
+    'ymd-slash': lambda d: f"'{d.year}/{d.month:02d}/{d.day:02d}'",
+    'mdy-slash': lambda d: f"{d.month:02d}/{d.day:02d}/{d.year}",
+    'dmy-slash': lambda d: f"{d.day:02d}/{d.month:02d}/{d.year}",
+}
+
+TAGS = ['work', 'home', 'errands', 'project/alpha', 'project/beta', 'project/gamma', 'health', 'finance']
+
+PHASES = [
+    'scan_cold', 'scan_warm', 'generate_today', 'generate_this_week', 'generate_next_week',
+    'sync_daily', 'sync_weekly', 'archive',
+]
+
+
+def parse_date_mix(spec: str) -> dict:
+    """Parse 'iso=0.8,mdy-slash=0.2' into normalized weights."""
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in DATE_WRITERS:
+            raise argparse.ArgumentTypeError(f"unknown date format {name!r} (choose from {', '.join(DATE_WRITERS)})")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"bad weight for {name!r}: {weight!r}")
+    total = sum(mix.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError("date mix weights must add up to more than 0")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+def ratio(value: str) -> float:
+    value = float(value)
+    if not 0 <= value <= 1:
+        raise argparse.ArgumentTypeError("must be between 0 and 1")
+    return value
+
+
+def build_vault(root: Path, options, today: datetime) -> dict:
+    """Write a synthetic vault under root. Returns its paths and task counts."""
+    config = {'paths': {'vault_root': str(root)}}
+    paths = get_paths(config)
+    paths['index'] = root / '.bench-index.json'
+
+    for key in ('tasks', 'completed', 'daily', 'weekly', 'templates'):
+        paths[key].mkdir(parents=True, exist_ok=True)
+    (paths['templates'] / 'Task.md').write_text('---\ndue:\n---\n')
+    (paths['templates'] / 'Daily.md').write_text('# {{date}}\n\n## Tasks\n\n## Notes\n')
+    (paths['templates'] / 'Weekly.md').write_text('# Week of {{date}}\n\n## Tasks\n\n## Review\n')
+
+    rng = random.Random(options.seed)
+    formats = list(options.date_mix)
+    weights = [options.date_mix[name] for name in formats]
+    counts = {'tasks': options.tasks, 'recurring': 0, 'completed': 0}
+
+    for i in range(options.tasks):
+        due = today + timedelta(days=rng.randint(-options.spread // 3, options.spread))
+        fmt = rng.choices(formats, weights)[0]
+        lines = ['---', f"due: {DATE_WRITERS[fmt](due)}"]
+
+        tags = rng.sample(TAGS, rng.randint(0, 3))
+        if tags:
+            lines.append('tags:')
+            lines.extend(f"  - {tag}" for tag in tags)
+
+        body = [f"# Task {i}", '', f"Synthetic task {i} for benchmarking."]
+        if rng.random() < options.recurring:
+            counts['recurring'] += 1
+            recurrence = rng.choice(RECURRENCES)
+            lines.append(f"recurrence: {recurrence}")
+            lines.append(f"recurrence_day: {rng.randint(1, 28)}")
+            body += ['', '## Instructions', '', 'Do the thing.', '', '## History']
+            for h in range(options.history):
+                body.append(f"- {(due - timedelta(days=7 * (h + 1))).strftime('%Y-%m-%d')}: Completed")
+        elif rng.random() < options.completed:
+            counts['completed'] += 1
+            lines.append(f"completed: {(due + timedelta(days=rng.randint(-3, 10))).strftime('%Y-%m-%d')}")
+
+        lines.append('---')
+        with open(paths['tasks'] / f"task-{i:06d}.md", 'w') as f:
+            f.write('\n'.join(lines + body) + '\n')
+
+    return {'paths': paths, 'counts': counts}
+
+
+def timed(results: dict, phase: str, func, *args):
+    start = time.perf_counter()
+    value = func(*args)
+    results[phase] = time.perf_counter() - start
+    return value
+
+
+def run_once(options, today: datetime) -> tuple[dict, dict]:
+    """Build a fresh vault and time every phase once."""
+    root = Path(tempfile.mkdtemp(prefix='task-bench-', dir=options.dir))
+    try:
+        vault = build_vault(root, options, today)
+        paths = vault['paths']
+        parse_date_string.cache_clear()
+        WRITE_STATS.update(written=0, skipped=0)
+
+        results = {}
+        timed(results, 'scan_cold', scan_tasks, paths['tasks'], paths['index'], options.workers)
+        tasks = timed(results, 'scan_warm', scan_tasks, paths['tasks'], paths['index'], options.workers)
+        timed(results, 'generate_today', generate_today_md, tasks, today, paths['today_file'])
+        timed(results, 'generate_this_week', generate_this_week_md, tasks, today, paths['this_week_file'])
+        timed(results, 'generate_next_week', generate_next_week_md, tasks, today, paths['next_week_file'])
+        timed(results, 'sync_daily', sync_to_daily_note, paths, today)
+        timed(results, 'sync_weekly', sync_to_weekly_note, paths, today)
+        archived = timed(results, 'archive', archive_completed_tasks, tasks, paths['completed'])
+
+        counts = dict(vault['counts'], archived=len(archived))
+        return results, counts
+    finally:
+        if not options.keep:
+            shutil.rmtree(root, ignore_errors=True)
+        else:
+            print(f"Kept vault at {root}", file=sys.stderr)
+
+
+def run_benchmark(options) -> dict:
+    today = datetime.strptime(options.today, '%Y-%m-%d')
+    runs = {phase: [] for phase in PHASES}
+    counts = {}
+    for _ in range(options.repeat):
+        results, counts = run_once(options, today)
+        for phase, seconds in results.items():
+            runs[phase].append(seconds)
+
+    return {
+        'version': RESULTS_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {
+            'tasks': options.tasks,
+            'recurring': options.recurring,
+            'history': options.history,
+            'completed': options.completed,
+            'date_mix': options.date_mix,
+            'spread': options.spread,
+            'seed': options.seed,
+            'today': options.today,
+            'workers': options.workers,
+            'repeat': options.repeat,
+        },
+        'counts': counts,
+        'phases': {
+            phase: {'min': min(times), 'median': statistics.median(times), 'runs': times}
+            for phase, times in runs.items()
+        },
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print median times against the baseline. Returns phases slower than threshold allows."""
+    if baseline.get('params') != results['params']:
+        print("Warning: baseline was recorded with different parameters", file=sys.stderr)
+
+    regressions = []
+    print(f"{'phase':<20} {'baseline':>10} {'current':>10} {'change':>8}")
+    for phase, current in results['phases'].items():
+        before = baseline.get('phases', {}).get(phase)
+        if not before or not before['median']:
+            print(f"{phase:<20} {'-':>10} {current['median'] * 1000:>8.1f}ms")
+            continue
+        change = current['median'] / before['median'] - 1
+        flag = ''
+        if change > threshold and current['median'] - before['median'] > NOISE_FLOOR:
+            regressions.append(phase)
+            flag = '  REGRESSION'
+        print(f"{phase:<20} {before['median'] * 1000:>8.1f}ms {current['median'] * 1000:>8.1f}ms {change:>+7.0%}{flag}")
+    return regressions
+
+
+def print_results(results: dict):
+    counts = results['counts']
+    print(f"{counts['tasks']} tasks ({counts['recurring']} recurring, {counts['completed']} completed), "
+          f"{results['params']['repeat']} run(s)")
+    print(f"{'phase':<20} {'min':>10} {'median':>10}")
+    for phase, times in results['phases'].items():
+        print(f"{phase:<20} {times['min'] * 1000:>8.1f}ms {times['median'] * 1000:>8.1f}ms")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=1000, help='number of task files (default: 1000)')
+    parser.add_argument('--recurring', type=ratio, default=0.1, help='share of recurring tasks (default: 0.1)')
+    parser.add_argument('--history', type=int, default=10,
+                        help='## History entries per recurring task (default: 10)')
+    parser.add_argument('--completed', type=ratio, default=0.1,
+                        help='share of one-time tasks with a completed date (default: 0.1)')
+    parser.add_argument('--date-mix', type=parse_date_mix, default=parse_date_mix('iso'),
+                        help=f"due date formats as name=weight pairs, e.g. iso=0.9,mdy-slash=0.1 "
+                             f"(formats: {', '.join(DATE_WRITERS)}; default: iso)")
+    parser.add_argument('--spread', type=int, default=60,
+                        help='due dates fall from spread/3 days ago to spread days ahead (default: 60)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    parser.add_argument('--today', default='2026-01-07', help='date to generate views for (default: 2026-01-07)')
+    parser.add_argument('--workers', type=int, default=0, help='scan worker threads, as scan.workers (default: 0)')
+    parser.add_argument('--repeat', type=int, default=3, help='fresh vaults to time; medians are reported (default: 3)')
+    parser.add_argument('--dir', help='create the vault under this directory (default: system temp dir)')
+    parser.add_argument('--keep', action='store_true', help='keep the generated vault(s) for inspection')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--baseline', help='compare against results saved with --output')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='fail when a phase median is this much slower than the baseline (default: 0.25)')
+    args = parser.parse_args(argv)
+    if args.tasks < 1 or args.repeat < 1:
+        parser.error("--tasks and --repeat must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_benchmark(args)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} phase(s) regressed more than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+    else:
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
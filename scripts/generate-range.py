@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Render tasks due in a date range (next 30 days by default)."""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from task_profile import add_profile_args, run_profiled
+from tasks import Session, add_vault_args, add_range_args, cmd_range
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_range_args(parser)
+    add_vault_args(parser, several=False)
+    add_profile_args(parser)
+    args = parser.parse_args()
+    if args.month and (args.start or args.end):
+        parser.error("--month cannot be combined with --from/--to")
+    if args.days < 1:
+        parser.error("--days must be at least 1")
+    return args
+
+
+def main():
+    args = parse_args()
+    sys.exit(run_profiled(args, lambda: cmd_range(Session(options=args))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Write completion stats: tasks completed per week, median lateness, recurring vs one-time."""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from task_profile import add_profile_args, run_profiled
+from tasks import Session, add_vault_args, cmd_stats, date_arg
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--from', dest='start', type=date_arg, metavar='DATE',
+                        help='only completions on or after DATE')
+    parser.add_argument('--to', dest='end', type=date_arg, metavar='DATE', help='only completions on or before DATE')
+    parser.add_argument('--output', metavar='PATH',
+                        help='write to PATH (relative to the vault root) instead of generated_files.stats')
+    add_vault_args(parser, several=False)
+    add_profile_args(parser)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    sys.exit(run_profiled(args, lambda: cmd_stats(Session(options=args))))
+
+
+if __name__ == "__main__":
+    main()
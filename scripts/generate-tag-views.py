@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""Generate a page per tag with its overdue, today, this-week and next-week tasks."""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from task_profile import add_profile_args, run_profiled
+from tasks import Session, add_vault_args, add_tag_args, cmd_tags
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_tag_args(parser)
+    add_vault_args(parser, several=False)
+    add_profile_args(parser)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    sys.exit(run_profiled(args, lambda: cmd_tags(Session(options=args))))
+
+
+if __name__ == "__main__":
+    main()
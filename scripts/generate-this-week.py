@@ -1,25 +1,27 @@
 #!/usr/bin/env python3
 """Generate this-week.md file."""
 
+import argparse
 import sys
-from datetime import datetime
 from pathlib import Path
 
 # Add scripts directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from task_utils import load_config, get_paths, scan_tasks, generate_this_week_md
+from task_profile import add_profile_args, run_profiled
+from tasks import Session, add_vault_args, cmd_this_week
 
 
-def main():
-    config = load_config()
-    paths = get_paths(config)
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_vault_args(parser, several=False)
+    add_profile_args(parser)
+    return parser.parse_args()
 
-    tasks = scan_tasks(paths['tasks'])
-    stats = generate_this_week_md(tasks, today, paths['this_week_file'])
 
-    print(f"Generated this-week.md: {stats['total']} tasks")
+def main():
+    args = parse_args()
+    run_profiled(args, lambda: cmd_this_week(Session(options=args)))
 
 
 if __name__ == "__main__":
@@ -1,11 +1,22 @@
 #!/usr/bin/env python3
 """Validate vault structure for task management plugin."""
 
+import argparse
+import io
+import json
 import os
 import sys
+import time
+from contextlib import redirect_stdout
 import yaml
 from pathlib import Path
 
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from task_check import ISSUE_KINDS, deep_check
+from task_utils import get_paths, load_frontmatter_yaml, vault_configs
+
 CONFIG_PATH = Path.home() / ".claude" / "task-management-config" / "config.yaml"
 
 def load_config():
@@ -32,29 +43,82 @@ def check_template(vault_root: Path, template: str, check_tasks_heading: bool =
 
     return True, True
 
-def main():
-    print("Task Management Install Check")
-    print("=" * 30)
-    print()
+def load_reference(text: str) -> str:
+    """yaml.safe_load result (or error) as a type-exact string for comparison."""
+    try:
+        return repr(yaml.safe_load(text))
+    except (yaml.YAMLError, ValueError):
+        return 'error'
 
-    all_passed = True
-    missing_folders = []
 
-    # Check config file
-    if not CONFIG_PATH.exists():
-        print(f"✗ Config file not found: {CONFIG_PATH}")
-        print()
-        print("Create the config file with:")
-        print(f"  mkdir -p {CONFIG_PATH.parent}")
-        print(f"  # Then create {CONFIG_PATH} with vault_root path")
-        sys.exit(1)
-    else:
-        print(f"✓ Config file exists")
+def load_fast(text: str) -> str:
+    try:
+        return repr(load_frontmatter_yaml(text))
+    except (yaml.YAMLError, ValueError):
+        return 'error'
+
+
+def header_text(content: str) -> str | None:
+    """The YAML between the frontmatter delimiters, as parse_frontmatter sees it."""
+    if not content.startswith('---'):
+        return None
+    parts = content.split('---', 2)
+    return parts[1] if len(parts) == 3 else None
+
+
+def check_parser(vault_root: Path, folders_config: dict) -> bool:
+    """Check the fast frontmatter parser against yaml.safe_load on every header in the vault."""
+    headers = []
+
+    tasks_dir = vault_root / folders_config.get('tasks', 'notes/tasks')
+    completed_dir = vault_root / folders_config.get('completed', 'notes/tasks/completed')
+    for folder in {tasks_dir, completed_dir}:
+        for task_file in sorted(folder.rglob('*.md')) if folder.is_dir() else []:
+            text = header_text(task_file.read_text())
+            if text is not None:
+                headers.append((str(task_file.relative_to(vault_root)), text))
+
+    mismatches = 0
+    for source, text in headers:
+        expected, actual = load_reference(text), load_fast(text)
+        if expected != actual:
+            mismatches += 1
+            print(f"✗ {source}: {text!r}")
+            print(f"    yaml.safe_load: {expected}")
+            print(f"    fast parser:    {actual}")
+
+    if mismatches:
+        print(f"✗ Fast frontmatter parser differs on {mismatches} of {len(headers)} header(s)")
+        return False
+    print(f"✓ Fast frontmatter parser matches yaml.safe_load on {len(headers)} header(s)")
+    return True
 
-    config = load_config()
-    if not config:
-        print("✗ Config file is empty or invalid")
-        sys.exit(1)
+
+def print_deep_check(summary: dict, seconds: float, limit: int = 20):
+    """Print deep-check counts per issue kind, with up to `limit` files for each."""
+    print(f"Deep check of {summary['files']} task file(s) in {seconds:.1f} s:")
+    by_kind = {}
+    for issue in summary['issues']:
+        by_kind.setdefault(issue['kind'], []).append(issue)
+    for kind, label in ISSUE_KINDS.items():
+        issues = by_kind.get(kind, [])
+        if not issues:
+            print(f"✓ {label}: none")
+            continue
+        print(f"✗ {label}: {len(issues)}")
+        for issue in issues[:limit]:
+            print(f"    {issue['path']}: {issue['detail']}")
+        if len(issues) > limit:
+            print(f"    ... and {len(issues) - limit} more (use --json for the full list)")
+
+
+def check_vault(config: dict, args) -> tuple[bool, list[Path], dict | None]:
+    """Check one vault's root, folders and templates (and files, with --deep).
+
+    Returns (passed, missing folders, deep-check summary or None).
+    """
+    all_passed = True
+    missing_folders = []
 
     # Get vault root
     vault_root_str = config.get('paths', {}).get('vault_root')
@@ -93,7 +157,7 @@ def main():
         else:
             print(f"✗ {display_name} does not exist")
             all_passed = False
-            missing_folders.append(folder)
+            missing_folders.append(vault_root / folder)
 
     # Check templates
     templates = [
@@ -115,6 +179,79 @@ def main():
         else:
             print(f"✓ {display_name} exists")
 
+    if args.check_parser and vault_root.is_dir():
+        if not check_parser(vault_root, folders_config):
+            all_passed = False
+
+    summary = None
+    if args.deep and vault_root.is_dir():
+        start = time.perf_counter()
+        summary = deep_check(get_paths(config), args.workers)
+        print()
+        print_deep_check(summary, time.perf_counter() - start)
+        if summary['issues']:
+            all_passed = False
+
+    return all_passed, missing_folders, summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--check-parser', action='store_true',
+                        help='also verify the fast frontmatter parser against yaml.safe_load')
+    parser.add_argument('--deep', action='store_true',
+                        help='also validate every task and archived file (frontmatter, due, recurrence, '
+                             'history, archive name clashes)')
+    parser.add_argument('--json', action='store_true',
+                        help='print only a JSON summary of the checks (implies --deep)')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='processes for --deep (default: one per core)')
+    args = parser.parse_args(argv)
+    if args.json:
+        args.deep = True
+    return args
+
+
+def run_checks(args, results: dict):
+    """Run every check, printing as it goes; fills results with {vault: {'passed', 'deep'}}."""
+    print("Task Management Install Check")
+    print("=" * 30)
+    print()
+
+    all_passed = True
+    missing_folders = []
+
+    # Check config file
+    if not CONFIG_PATH.exists():
+        print(f"✗ Config file not found: {CONFIG_PATH}")
+        print()
+        print("Create the config file with:")
+        print(f"  mkdir -p {CONFIG_PATH.parent}")
+        print(f"  # Then create {CONFIG_PATH} with vault_root path")
+        sys.exit(1)
+    else:
+        print(f"✓ Config file exists")
+
+    config = load_config()
+    if not config:
+        print("✗ Config file is empty or invalid")
+        sys.exit(1)
+
+    try:
+        vaults = vault_configs(config)
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    for name, vault_config in vaults.items():
+        if len(vaults) > 1:
+            print()
+            print(f"Vault: {name}")
+        passed, missing, summary = check_vault(vault_config, args)
+        results[name] = {'passed': passed, 'deep': summary}
+        all_passed = all_passed and passed
+        missing_folders.extend(missing)
+
     print()
 
     if all_passed:
@@ -126,10 +263,33 @@ def main():
             print()
             print("Missing folders can be created with:")
             for folder in missing_folders:
-                print(f"  mkdir -p \"{vault_root / folder}\"")
+                print(f"  mkdir -p \"{folder}\"")
         print()
         print("Note: Templates must be created manually by the user.")
         sys.exit(1)
 
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = {}
+    if not args.json:
+        run_checks(args, results)
+        return
+
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output):
+            run_checks(args, results)
+    except SystemExit as e:
+        status = e.code or 0
+    report = {'ok': status == 0, 'vaults': results}
+    if not results:
+        # Stopped before any vault was checked (no config, bad config...)
+        report['error'] = next((line.lstrip('✗ ') for line in output.getvalue().splitlines() if line.startswith('✗')),
+                               None)
+    print(json.dumps(report))
+    sys.exit(status)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Query tasks and archived tasks through the SQLite mirror.
+
+Presets: overdue (open tasks due before today), completed (completed in
+--from/--to), no-history (recurring tasks with an empty or missing
+## History). Filters combine with any preset; --sql runs a read-only
+statement against the mirror's `tasks` and `task_tags` tables.
+"""
+
+import argparse
+import json
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from task_mirror import get_mirror_path, open_mirror, query_tasks, run_sql, sync_mirror
+from task_profile import add_profile_args, phase, run_profiled
+from tasks import Session, add_vault_args, add_tag_args, date_arg
+
+PRESETS = ['overdue', 'completed', 'no-history']
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('preset', nargs='?', choices=PRESETS, help='a common query')
+    parser.add_argument('--from', dest='start', type=date_arg, metavar='DATE',
+                        help='with completed: completed on or after DATE; otherwise due on or after DATE')
+    parser.add_argument('--to', dest='end', type=date_arg, metavar='DATE',
+                        help='with completed: completed on or before DATE; otherwise due on or before DATE')
+    parser.add_argument('--recurrence', help='only tasks with this recurrence value')
+    where = parser.add_mutually_exclusive_group()
+    where.add_argument('--archived', dest='archived', action='store_true', default=None,
+                       help='only archived tasks')
+    where.add_argument('--active', dest='archived', action='store_false', help='only tasks in the tasks folder')
+    parser.add_argument('--sql', help='run a read-only SQL statement instead of a preset')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--no-sync', action='store_true', help='query the mirror without checking for changed files')
+    add_tag_args(parser)
+    add_vault_args(parser, several=False)
+    add_profile_args(parser)
+    return parser.parse_args()
+
+
+def build_filters(args, today) -> dict:
+    filters = {'tags': args.tag, 'recurrence': args.recurrence, 'archived': args.archived}
+    if args.preset == 'completed':
+        filters.update(completed=True, completed_from=args.start, completed_to=args.end)
+    else:
+        filters.update(due_from=args.start, due_to=args.end)
+    if args.preset == 'overdue':
+        filters.update(completed=False, archived=False)
+        yesterday = today.date() - timedelta(days=1)
+        filters['due_to'] = min(args.end, yesterday) if args.end else yesterday
+    elif args.preset == 'no-history':
+        filters.update(recurring=True, max_history=0, archived=False)
+    return filters
+
+
+def print_results(results: list[dict]):
+    print(f"{len(results)} task(s):")
+    for result in results:
+        details = [f"due: {result['due']}"] if result['due'] else []
+        if result['completed']:
+            details.append(f"completed: {result['completed']}")
+        if result['recurrence']:
+            details.append(result['recurrence'])
+        suffix = f" ({', '.join(details)})" if details else ''
+        print(f"- [[{result['name']}]]{suffix}" + (' — archived' if result['archived'] else ''))
+
+
+def run(args) -> int:
+    session = Session(options=args)
+    mirror_path = get_mirror_path(session.paths)
+    db = open_mirror(mirror_path)
+    try:
+        if not args.no_sync:
+            with phase('sync'):
+                sync_mirror(db, session.paths)
+        if args.sql is None:
+            with phase('query'):
+                results = query_tasks(db, **build_filters(args, session.today))
+    finally:
+        db.close()
+
+    if args.sql is not None:
+        import sqlite3
+
+        try:
+            with phase('query'):
+                columns, rows = run_sql(mirror_path, args.sql)
+        except sqlite3.Error as e:
+            print(f"SQL error: {e}", file=sys.stderr)
+            return 1
+        if args.json:
+            print(json.dumps([dict(zip(columns, row)) for row in rows], default=str))
+        else:
+            print('\t'.join(columns))
+            for row in rows:
+                print('\t'.join('' if value is None else str(value) for value in row))
+        return 0
+
+    if args.json:
+        print(json.dumps(results))
+    else:
+        print_results(results)
+    return 0
+
+
+def main():
+    args = parse_args()
+    sys.exit(run_profiled(args, run, args))
+
+
+if __name__ == "__main__":
+    main()
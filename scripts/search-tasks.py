@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Search task and archived task files by content and frontmatter.
+
+Query syntax: words must all appear; "quoted words" must appear together;
+word* matches any word starting with "word".
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from task_profile import add_profile_args, phase, run_profiled
+from task_mirror import get_mirror_path, open_mirror, sync_mirror
+from task_search import search
+from tasks import Session, add_vault_args, add_tag_args, date_arg
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('query', nargs='*', help='words, "phrases" and prefix* terms')
+    parser.add_argument('--due-from', type=date_arg, metavar='DATE', help='due on or after DATE')
+    parser.add_argument('--due-to', type=date_arg, metavar='DATE', help='due on or before DATE')
+    status = parser.add_mutually_exclusive_group()
+    status.add_argument('--completed', dest='completed', action='store_true', default=None,
+                        help='only tasks with a completed date')
+    status.add_argument('--open', dest='completed', action='store_false', help='only tasks without a completed date')
+    parser.add_argument('--limit', type=int, default=50, help='most results to show, 0 for all (default: 50)')
+    parser.add_argument('--no-refresh', action='store_true',
+                        help='query the index as it is, without checking for changed files first')
+    add_tag_args(parser)
+    add_vault_args(parser, several=False)
+    add_profile_args(parser)
+    return parser.parse_args()
+
+
+def run(args) -> int:
+    session = Session(options=args)
+    db = open_mirror(get_mirror_path(session.paths))
+    try:
+        if not args.no_refresh:
+            with phase('refresh'):
+                stats = sync_mirror(db, session.paths)
+            if any(stats.values()):
+                print(f"Indexed {stats['added']} new, {stats['updated']} changed, {stats['removed']} removed file(s)")
+
+        start = time.perf_counter()
+        with phase('search'):
+            results = search(
+                db, ' '.join(args.query),
+                due_from=args.due_from.toordinal() if args.due_from else None,
+                due_to=args.due_to.toordinal() if args.due_to else None,
+                tags=args.tag, completed=args.completed, limit=args.limit or None,
+            )
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        db.close()
+
+    print(f"{len(results)} match(es) in {elapsed:.1f} ms" + (" (limit reached)" if len(results) == args.limit else ''))
+    for result in results:
+        details = [f"due: {result['due']}"] if result['due'] else []
+        if result['completed']:
+            details.append(f"completed: {result['completed']}")
+        suffix = f" ({', '.join(details)})" if details else ''
+        print(f"- [[{result['name']}]]{suffix} — {result['path']}")
+    return 0
+
+
+def main():
+    args = parse_args()
+    sys.exit(run_profiled(args, run, args))
+
+
+if __name__ == "__main__":
+    main()
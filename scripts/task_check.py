@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Deep validation of every task and archived task file (install-check.py --deep).
+
+parse_frontmatter turns YAML errors into {} and normalize_date returns None
+for dates it can't read, so a broken task just disappears from the views.
+This finds those files instead. Each file is checked on its header alone,
+except recurring tasks, which are read in full to look for ## History.
+Files are split into chunks and checked on a process pool, so YAML parsing
+uses every core.
+"""
+
+import os
+from collections import defaultdict
+from pathlib import Path
+
+from task_utils import (
+    HISTORY_HEADING, RECURRENCE_STEPS, list_vault_files, load_frontmatter_yaml, normalize_date, read_header_bytes,
+    read_text,
+)
+
+# Issue kinds, in report order
+ISSUE_KINDS = {
+    'malformed_frontmatter': 'malformed frontmatter',
+    'missing_due': 'missing due date',
+    'unparseable_due': 'unparseable due date',
+    'unknown_recurrence': 'unknown recurrence value',
+    'missing_history': 'recurring task without ## History',
+    'archive_clash': 'archive filename clash',
+}
+
+# Files per worker task; below two chunks the check runs in-process
+CHECK_CHUNK = 1000
+
+
+def check_header(header: bytes) -> tuple[dict | None, str | None]:
+    """Parse a header as parse_frontmatter would. Returns (frontmatter, None) or (None, problem)."""
+    try:
+        text = header.decode('utf-8')
+    except UnicodeDecodeError as e:
+        return None, f"not UTF-8 ({e.reason} at byte {e.start})"
+    if not text.startswith('---'):
+        return None, "no frontmatter (file does not start with ---)"
+    parts = text.split('---', 2)
+    if len(parts) < 3:
+        return None, "no closing --- line"
+    try:
+        frontmatter = load_frontmatter_yaml(parts[1])
+    except ValueError as e:  # FrontmatterError, or impossible dates like 2025-13-01
+        return None, ' '.join(str(e).split())
+    if frontmatter is None:
+        return {}, None
+    if not isinstance(frontmatter, dict):
+        return None, f"frontmatter is a {type(frontmatter).__name__}, not key: value pairs"
+    return frontmatter, None
+
+
+def check_task_file(path: str) -> list[tuple[str, str]]:
+    """Problems with one file, as (issue kind, detail) pairs."""
+    try:
+        frontmatter, problem = check_header(read_header_bytes(path))
+    except OSError as e:
+        return [('malformed_frontmatter', f"unreadable: {e.strerror}")]
+    if problem:
+        return [('malformed_frontmatter', problem)]
+
+    issues = []
+    due = frontmatter.get('due')
+    if due is None:
+        issues.append(('missing_due', 'no due: value'))
+    elif normalize_date(due) is None:
+        issues.append(('unparseable_due', f"due: {due!r}"))
+
+    recurrence = frontmatter.get('recurrence')
+    if recurrence is not None and (not isinstance(recurrence, str) or recurrence not in RECURRENCE_STEPS):
+        issues.append(('unknown_recurrence', f"recurrence: {recurrence!r}"))
+    if recurrence:
+        try:
+            has_history = HISTORY_HEADING.search(read_text(Path(path))) is not None
+        except (OSError, UnicodeDecodeError):
+            has_history = False
+        if not has_history:
+            issues.append(('missing_history', 'no ## History heading'))
+    return issues
+
+
+def check_chunk(files: list[tuple[str, str]]) -> list[tuple[str, str, str]]:
+    """Check (relative path, path) pairs. Returns (relative path, kind, detail) per problem."""
+    return [(relpath, kind, detail) for relpath, path in files for kind, detail in check_task_file(path)]
+
+
+def archive_clashes(files: dict) -> list[tuple[str, str, str]]:
+    """Archived files whose name is used by another archived file or by an open task.
+
+    Obsidian resolves [[name]] by file name alone, so these links are ambiguous.
+    """
+    by_name = defaultdict(list)
+    for relpath, (_, _, archived) in files.items():
+        by_name[os.path.splitext(os.path.basename(relpath))[0]].append((relpath, archived))
+
+    issues = []
+    for name, entries in by_name.items():
+        archived = [relpath for relpath, in_archive in entries if in_archive]
+        if not archived or len(entries) < 2:
+            continue
+        others = sorted(relpath for relpath, _ in entries)
+        for relpath in sorted(archived):
+            clashing = ', '.join(other for other in others if other != relpath)
+            issues.append((relpath, 'archive_clash', f"[[{name}]] also names {clashing}"))
+    return issues
+
+
+def deep_check(paths: dict, workers: int = 0) -> dict:
+    """Check every task and archived task file in a vault.
+
+    workers sets the process count (0 = one per core). Returns {'files':
+    n, 'counts': {kind: n}, 'issues': [{'path', 'kind', 'detail'}]} with
+    issues sorted by kind, then path.
+    """
+    files = list_vault_files(paths)
+    items = [(relpath, path) for relpath, (path, _, _) in files.items()]
+    chunks = [items[i:i + CHECK_CHUNK] for i in range(0, len(items), CHECK_CHUNK)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers > 1 and len(chunks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            found = [issue for chunk_issues in pool.map(check_chunk, chunks) for issue in chunk_issues]
+    else:
+        found = [issue for chunk in chunks for issue in check_chunk(chunk)]
+    found.extend(archive_clashes(files))
+
+    order = list(ISSUE_KINDS)
+    found.sort(key=lambda issue: (order.index(issue[1]), issue[0]))
+    counts = {kind: 0 for kind in ISSUE_KINDS}
+    for _, kind, _ in found:
+        counts[kind] += 1
+    return {
+        'files': len(files),
+        'counts': counts,
+        'issues': [{'path': relpath, 'kind': kind, 'detail': detail} for relpath, kind, detail in found],
+    }
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""SQLite mirror of task and archived task files for indexed queries and search.
+
+Each task file is a row keyed by its path relative to the vault, with its
+stat key, due/completed dates as ordinals, recurrence fields and tags
+(plus a tag table indexed for nested-tag lookups), and its words in an
+inverted index of word -> (path, positions) for task_search. sync_mirror
+re-reads only files whose stat changed.
+
+With `mirror.enabled: true` in config.yaml, the scripts load tasks from the
+mirror instead of scanning the folder (see mirror_tasks).
+"""
+
+import json
+import re
+import sqlite3
+from array import array
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+
+from task_utils import (
+    Task, date_ordinal, expand_tags, get_cache_path, history_entries, list_vault_files, ordinal_to_str,
+    parse_frontmatter, read_text, task_tags,
+)
+
+MIRROR_VERSION = 3
+
+WORD = re.compile(r'\w+')
+
+SCHEMA = """
+CREATE TABLE tasks (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    archived INTEGER NOT NULL,
+    mtime_ns INTEGER, size INTEGER, ino INTEGER,
+    due INTEGER, raw_due TEXT, completed INTEGER,
+    recurrence TEXT, recurrence_day TEXT, tags TEXT,
+    history INTEGER
+);
+CREATE INDEX tasks_due ON tasks (archived, due);
+-- Search result order (see task_search.search)
+CREATE INDEX tasks_order ON tasks (due IS NULL, due, name, path);
+CREATE INDEX tasks_completed ON tasks (completed);
+CREATE INDEX tasks_recurrence ON tasks (recurrence);
+CREATE TABLE task_tags (tag TEXT NOT NULL, path TEXT NOT NULL, PRIMARY KEY (tag, path)) WITHOUT ROWID;
+CREATE INDEX task_tags_path ON task_tags (path);
+CREATE TABLE postings (token TEXT NOT NULL, path TEXT NOT NULL, positions BLOB NOT NULL,
+                       PRIMARY KEY (token, path)) WITHOUT ROWID;
+CREATE INDEX postings_path ON postings (path);
+"""
+
+
+def get_mirror_path(paths: dict) -> Path:
+    return get_cache_path(paths['tasks'], 'mirror', 'sqlite')
+
+
+def open_mirror(mirror_path: Path) -> sqlite3.Connection:
+    """Open the mirror, (re)creating it if missing or from another version."""
+    mirror_path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(mirror_path)
+    if db.execute('PRAGMA user_version').fetchone()[0] != MIRROR_VERSION:
+        db.executescript('DROP TABLE IF EXISTS tasks; DROP TABLE IF EXISTS task_tags; DROP TABLE IF EXISTS postings;')
+        db.executescript(SCHEMA)
+        db.execute(f'PRAGMA user_version = {MIRROR_VERSION}')
+        db.commit()
+    return db
+
+
+def tokenize(text: str) -> list[str]:
+    return WORD.findall(text.lower())
+
+
+def mirror_row(relpath: str, task_file: Path, stat_key: tuple, archived: bool) -> tuple[tuple, list[str], list]:
+    """A file's tasks row, its tags (with ancestors) and its postings rows."""
+    content = read_text(task_file)
+    frontmatter, body = parse_frontmatter(content)
+    task = Task.from_frontmatter(task_file, frontmatter)
+    row = (
+        relpath, task.name, int(archived), *stat_key,
+        task.due_ordinal, task.raw_due, task.completed_ordinal,
+        None if task.recurrence is None else str(task.recurrence),
+        None if task.recurrence_day is None else json.dumps(task.recurrence_day, default=str),
+        None if task.tags is None else json.dumps(task.tags, default=str),
+        len(history_entries(content) or []) if task.recurrence else None,
+    )
+
+    positions = defaultdict(lambda: array('i'))
+    for position, token in enumerate(tokenize(task.name) + tokenize(body)):
+        positions[token].append(position)
+    postings = [(token, relpath, token_positions.tobytes()) for token, token_positions in positions.items()]
+    return row, expand_tags(task_tags(task)), postings
+
+
+def sync_mirror(db: sqlite3.Connection, paths: dict, archived: bool = True) -> dict:
+    """Bring the mirror up to date with the files. Returns {'added', 'updated', 'removed'}.
+
+    With archived=False only the tasks folder is checked, and archived rows
+    are left as they were. Changed files are written as they are read, in
+    one transaction, so memory stays flat on a first sync of a large archive.
+    """
+    files = list_vault_files(paths, archived)
+    sql = 'SELECT path, mtime_ns, size, ino FROM tasks' + ('' if archived else ' WHERE archived = 0')
+    mirrored = {path: (mtime_ns, size, ino) for path, mtime_ns, size, ino in db.execute(sql)}
+
+    stats = {'added': 0, 'updated': 0, 'removed': 0}
+    removed = [(path,) for path in mirrored if path not in files]
+    with db:
+        for table in ('postings', 'task_tags', 'tasks'):
+            db.executemany(f'DELETE FROM {table} WHERE path = ?', removed)
+        for relpath, (task_file, stat_key, in_archive) in files.items():
+            known = mirrored.get(relpath)
+            if known == stat_key:
+                continue
+            try:
+                row, tags, postings = mirror_row(relpath, Path(task_file), stat_key, in_archive)
+            except (OSError, UnicodeDecodeError):
+                # Deleted or unreadable since the listing; picked up next sync
+                continue
+            if known:
+                db.execute('DELETE FROM postings WHERE path = ?', (relpath,))
+                db.execute('DELETE FROM task_tags WHERE path = ?', (relpath,))
+            db.execute('INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', row)
+            db.executemany('INSERT OR IGNORE INTO task_tags (tag, path) VALUES (?, ?)',
+                           [(tag, relpath) for tag in tags])
+            db.executemany('INSERT INTO postings (token, path, positions) VALUES (?, ?, ?)', postings)
+            stats['updated' if known else 'added'] += 1
+    stats['removed'] = len(removed)
+    return stats
+
+
+def row_to_task(vault_root: Path, row: tuple) -> Task:
+    path, due, raw_due, completed, recurrence, recurrence_day, tags = row
+    return Task(
+        vault_root / path, due, completed, raw_due, recurrence,
+        None if recurrence_day is None else json.loads(recurrence_day),
+        None if tags is None else json.loads(tags),
+    )
+
+
+def mirror_tasks(paths: dict) -> list[Task]:
+    """Tasks in the tasks folder, loaded from the synced mirror instead of a folder scan."""
+    db = open_mirror(get_mirror_path(paths))
+    try:
+        sync_mirror(db, paths, archived=False)
+        rows = db.execute('SELECT path, due, raw_due, completed, recurrence, recurrence_day, tags '
+                          'FROM tasks WHERE archived = 0 ORDER BY path')
+        return [row_to_task(paths['vault_root'], row) for row in rows]
+    finally:
+        db.close()
+
+
+def query_tasks(db: sqlite3.Connection, due_from: date | None = None, due_to: date | None = None,
+                completed_from: date | None = None, completed_to: date | None = None,
+                completed: bool | None = None, archived: bool | None = None, tags: list[str] | None = None,
+                recurrence: str | None = None, recurring: bool | None = None,
+                max_history: int | None = None) -> list[dict]:
+    """Query the mirror; every filter is optional and they combine with AND.
+
+    Dates are inclusive. tags match nested tags too. recurring=True keeps
+    tasks with any recurrence; max_history keeps recurring tasks with at
+    most that many ## History entries. Results are ordered by due date,
+    then name.
+    """
+    where, params = [], []
+    for column, op, value in (('due', '>=', due_from), ('due', '<=', due_to),
+                              ('completed', '>=', completed_from), ('completed', '<=', completed_to)):
+        if value is not None:
+            where.append(f"{column} {op} ?")
+            params.append(date_ordinal(value))
+    if completed is not None:
+        where.append('completed IS NOT NULL' if completed else 'completed IS NULL')
+    if archived is not None:
+        where.append('archived = ?')
+        params.append(int(archived))
+    if recurrence is not None:
+        where.append('recurrence = ?')
+        params.append(recurrence)
+    if recurring is not None:
+        where.append('recurrence IS NOT NULL' if recurring else 'recurrence IS NULL')
+    if max_history is not None:
+        where.append('history <= ?')
+        params.append(max_history)
+    if tags:
+        where.append(f"path IN (SELECT path FROM task_tags WHERE tag IN ({', '.join('?' * len(tags))}))")
+        params.extend(tag.strip('#/') for tag in tags)
+
+    sql = ('SELECT path, name, archived, due, completed, recurrence, tags, history FROM tasks'
+           + (' WHERE ' + ' AND '.join(where) if where else '')
+           + ' ORDER BY due IS NULL, due, name')
+    return [
+        {'path': path, 'name': name, 'archived': bool(archived_flag), 'due': ordinal_to_str(due),
+         'completed': ordinal_to_str(done), 'recurrence': recurrence,
+         'tags': json.loads(tags_json) if tags_json else [], 'history': history}
+        for path, name, archived_flag, due, done, recurrence, tags_json, history in db.execute(sql, params)
+    ]
+
+
+def run_sql(mirror_path: Path, sql: str) -> tuple[list[str], list[tuple]]:
+    """Run a read-only SQL statement against the mirror. Returns (column names, rows)."""
+    db = sqlite3.connect(f"file:{mirror_path}?mode=ro", uri=True)
+    try:
+        cursor = db.execute(sql)
+        columns = [column[0] for column in cursor.description or []]
+        return columns, cursor.fetchall()
+    finally:
+        db.close()
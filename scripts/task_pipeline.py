@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Asyncio pipeline for the daily run (--pipeline), for cloud-synced or network vaults.
+
+Every file operation (stat, read, write, mkdir, move) runs on a thread
+pool with at most `concurrency` in flight, so waits on a slow mount
+overlap instead of adding up. Steps that depend on each other still run
+in the serial order: scan, normalize dates, archive, render and write the
+views, then sync the notes (which read the written views). Within a step
+each file is handled by the same function as in tasks.today_steps, so
+the vault ends up exactly as a serial run leaves it.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from task_profile import phase
+from task_utils import (
+    is_archivable, load_archive_manifest, move_to_archive, normalize_task_dates, plan_archive, render_views,
+    save_archive_manifest, sync_to_daily_note, sync_to_weekly_note, write_view,
+)
+
+
+async def today_pipeline(session, concurrency: int) -> dict:
+    """Run the daily steps with overlapping I/O. Returns the same dict as today_steps."""
+    loop = asyncio.get_running_loop()
+    limit = asyncio.Semaphore(concurrency)
+    paths = session.paths
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        async def io(func, *args):
+            async with limit:
+                return await loop.run_in_executor(pool, func, *args)
+
+        # The scan reads task files on its own pool of the same size
+        session.scan_workers = max(session.scan_workers, concurrency)
+        tasks = await io(lambda: session.tasks)
+
+        # One batched patch, on its own pool of the same size
+        with phase('normalize'):
+            normalized = await io(normalize_task_dates, tasks, concurrency)
+
+        # Archive names are picked in task order (they depend on earlier
+        # picks); only the moves overlap
+        with phase('archive'):
+            archivable = [task for task in tasks if is_archivable(task)]
+            if archivable:
+                completed_dir = paths['completed']
+                manifest = await io(load_archive_manifest, completed_dir)
+                dests = await io(lambda: [plan_archive(manifest, completed_dir, task.path, task.completed_ordinal)
+                                          for task in archivable])
+                await asyncio.gather(*(io(move_to_archive, task.path, dest)
+                                       for task, dest in zip(archivable, dests)))
+                await io(save_archive_manifest, completed_dir, manifest)
+        archived = [task.name for task in archivable]
+        session.drop(archived)
+
+        with phase('render'):
+            rendered = render_views(session.buckets, session.today)
+            await asyncio.gather(*(io(write_view, content, paths[f"{name}_file"])
+                                   for name, (content, _) in rendered.items()))
+        views = {name: stats for name, (_, stats) in rendered.items()}
+        session.view_stats.update(views)
+
+        with phase('sync'):
+            daily_note, weekly_note = await asyncio.gather(
+                io(sync_to_daily_note, paths, session.today),
+                io(sync_to_weekly_note, paths, session.today),
+            )
+
+    return {'normalized': normalized, 'archived': archived, 'views': views,
+            'daily_note': daily_note, 'weekly_note': weekly_note}
+
+
+def run_today_pipeline(session, concurrency: int) -> dict:
+    return asyncio.run(today_pipeline(session, concurrency))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Per-phase timings, I/O counters and cProfile dumps for the scripts (--timings, --profile)."""
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+from task_utils import IO_STATS, WRITE_STATS
+
+# Wall time per phase in seconds, in the order phases first ran
+PHASE_TIMES = {}
+
+
+@contextmanager
+def phase(name: str):
+    """Add the wall time of a block to PHASE_TIMES[name]."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASE_TIMES[name] = PHASE_TIMES.get(name, 0.0) + time.perf_counter() - start
+
+
+def add_profile_args(parser):
+    parser.add_argument('--timings', nargs='?', const='text', choices=['text', 'json'],
+                        help='print wall time per phase and I/O counts to stderr, as text (default) or json')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='run under cProfile and write the stats to FILE (read with pstats or snakeviz)')
+
+
+def timings_report(total: float) -> dict:
+    """Phase times, I/O counts and index hit rate as a JSON-friendly dict."""
+    lookups = IO_STATS['index_hits'] + IO_STATS['index_misses']
+    return {
+        'total': total,
+        'phases': dict(PHASE_TIMES),
+        'io': dict(IO_STATS),
+        'writes_skipped': WRITE_STATS['skipped'],
+        'index_hit_rate': IO_STATS['index_hits'] / lookups if lookups else None,
+    }
+
+
+def format_bytes(n: int) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == 'B' else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def print_timings(report: dict, fmt: str = 'text', file=None):
+    file = file or sys.stderr
+    if fmt == 'json':
+        print(json.dumps(report), file=file)
+        return
+
+    io = report['io']
+    print("Timings:", file=file)
+    for name, seconds in report['phases'].items():
+        print(f"  {name:<12} {seconds * 1000:>9.1f} ms", file=file)
+    print(f"  {'total':<12} {report['total'] * 1000:>9.1f} ms", file=file)
+    print("I/O:", file=file)
+    print(f"  files stat'ed: {io['stat']}", file=file)
+    print(f"  files read:    {io['read']} ({format_bytes(io['bytes_read'])})", file=file)
+    print(f"  files written: {io['written']} ({format_bytes(io['bytes_written'])}), "
+          f"{report['writes_skipped']} unchanged skipped", file=file)
+    print(f"  frontmatter parses: {io['fast_parses'] + io['yaml_parses']} "
+          f"({io['yaml_parses']} YAML, {io['fast_parses']} fast path)", file=file)
+    if report['index_hit_rate'] is not None:
+        print(f"  index: {io['index_hits']} hits, {io['index_misses']} misses "
+              f"({report['index_hit_rate']:.1%} hit rate)", file=file)
+
+
+def run_profiled(args, func, *func_args):
+    """Call func(*func_args), honouring --profile and --timings. Returns its result."""
+    profiler = None
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    start = time.perf_counter()
+    try:
+        return func(*func_args)
+    finally:
+        total = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"Wrote profile to {args.profile}", file=sys.stderr)
+        if args.timings:
+            print_timings(timings_report(total), args.timings)
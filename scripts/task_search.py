@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Full-text search over task and archived task files.
+
+Searches the SQLite mirror (see task_mirror), which holds each file's
+frontmatter fields and an inverted index of word -> (path, positions).
+sync_mirror re-reads only files whose stat (mtime_ns, size, inode)
+changed. Every clause and filter runs inside one SQL query, ordered and
+limited by SQLite, and phrase positions are read only for the rows
+being checked, so common words cost about as much as rare ones.
+"""
+
+import re
+import sqlite3
+from array import array
+
+from task_mirror import get_mirror_path, open_mirror, sync_mirror, tokenize
+from task_utils import ordinal_to_str
+
+QUERY_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+# A clause matching at most this many postings drives the query (see search)
+DRIVE_MAX = 1000
+
+
+def parse_query(query: str) -> list[tuple[str, object]]:
+    """Split a query into ('word', w), ('prefix', p) and ('phrase', [w, ...]) clauses.
+
+    "quoted words" are a phrase, a trailing * makes a prefix, and a
+    term that tokenizes to several words (e.g. follow-up) is a phrase.
+    """
+    clauses = []
+    for match in QUERY_TERM.finditer(query):
+        quoted, raw = match.groups()
+        if quoted is not None:
+            words = tokenize(quoted)
+            prefix = False
+        else:
+            prefix = raw.endswith('*')
+            words = tokenize(raw.rstrip('*'))
+        if not words:
+            continue
+        if len(words) > 1:
+            clauses.append(('phrase', words))
+        elif prefix:
+            clauses.append(('prefix', words[0]))
+        else:
+            clauses.append(('word', words[0]))
+    return clauses
+
+
+def has_phrase(db: sqlite3.Connection, path: str, words: list[str]) -> bool:
+    """Whether the words appear at consecutive positions in one file."""
+    unique = sorted(set(words))
+    positions = {token: array('i', blob) for token, blob in db.execute(
+        f"SELECT token, positions FROM postings WHERE path = ? AND token IN ({', '.join('?' * len(unique))})",
+        (path, *unique))}
+    if len(positions) < len(unique):
+        return False
+    starts = set(positions[words[0]])
+    for offset, word in enumerate(words[1:], 1):
+        starts &= {position - offset for position in positions[word]}
+        if not starts:
+            return False
+    return True
+
+
+def clause_sql(kind: str, value: str) -> tuple[str, str, tuple]:
+    """(driving condition, per-row condition, params) for a word or prefix clause."""
+    if kind == 'prefix':
+        return ('path IN (SELECT path FROM postings WHERE token >= ? AND token < ?)',
+                'EXISTS (SELECT 1 FROM postings WHERE path = tasks.path AND token >= ? AND token < ?)',
+                (value, value + '\U0010ffff'))
+    return ('path IN (SELECT path FROM postings WHERE token = ?)',
+            'EXISTS (SELECT 1 FROM postings WHERE token = ? AND path = tasks.path)',
+            (value,))
+
+
+def clause_size(db: sqlite3.Connection, kind: str, value: str) -> int:
+    """Postings for a clause, counted up to DRIVE_MAX + 1."""
+    condition = 'token >= ? AND token < ?' if kind == 'prefix' else 'token = ?'
+    return db.execute(f'SELECT count(*) FROM (SELECT 1 FROM postings WHERE {condition} LIMIT ?)',
+                      (*clause_sql(kind, value)[2], DRIVE_MAX + 1)).fetchone()[0]
+
+
+def search(db: sqlite3.Connection, query: str = '', due_from: int | None = None, due_to: int | None = None,
+           tags: list[str] | None = None, completed: bool | None = None, limit: int | None = 50) -> list[dict]:
+    """Find tasks matching a query and frontmatter filters, by due date then name.
+
+    Due bounds are date ordinals (inclusive). tags match nested tags too;
+    completed=True/False keeps only files with/without a completed date.
+    Returns dicts with path (relative to the vault), name, due, completed
+    and archived.
+
+    If some clause matches at most DRIVE_MAX files (or there is no limit),
+    the query starts from that clause's postings and sorts just those
+    files. Otherwise every clause is common, and the query walks tasks in
+    result order through the tasks_order index, probing the postings and
+    tags of each row, until the limit is reached.
+    """
+    phrases = []
+    clauses = []
+    for kind, value in parse_query(query):
+        if kind == 'phrase':
+            # Needs each of its words; positions are checked per row below
+            phrases.append(value)
+            clauses.extend(('word', word) for word in sorted(set(value)))
+        else:
+            clauses.append((kind, value))
+    clauses = list(dict.fromkeys(clauses))
+
+    driver = None
+    if clauses:
+        sizes = [clause_size(db, kind, value) for kind, value in clauses]
+        if not min(sizes):
+            return []
+        if not limit or min(sizes) <= DRIVE_MAX:
+            driver = sizes.index(min(sizes))
+
+    where, params = [], []
+    for i, (kind, value) in enumerate(clauses):
+        driving, per_row, clause_params = clause_sql(kind, value)
+        where.append(driving if i == driver else per_row)
+        params.extend(clause_params)
+    if due_from is not None:
+        where.append('due >= ?')
+        params.append(due_from)
+    if due_to is not None:
+        where.append('due <= ?')
+        params.append(due_to)
+    if completed is not None:
+        where.append('completed IS NOT NULL' if completed else 'completed IS NULL')
+    if tags:
+        where.append(f"EXISTS (SELECT 1 FROM task_tags WHERE tag IN ({', '.join('?' * len(tags))}) AND path = tasks.path)")
+        params.extend(tag.strip('#/') for tag in tags)
+
+    # Walking must follow the result order even where a filter's own index looks cheaper
+    sql = ('SELECT path, name, due, completed, archived FROM tasks'
+           + (' INDEXED BY tasks_order' if clauses and driver is None else '')
+           + (' WHERE ' + ' AND '.join(where) if where else '')
+           + ' ORDER BY due IS NULL, due, name, path')
+    if limit and not phrases:
+        sql += f' LIMIT {int(limit)}'
+
+    results = []
+    for path, name, due, done, archived in db.execute(sql, params):
+        if phrases and not all(has_phrase(db, path, words) for words in phrases):
+            continue
+        results.append({'path': path, 'name': name, 'due': ordinal_to_str(due), 'completed': ordinal_to_str(done),
+                        'archived': bool(archived)})
+        if limit and len(results) >= limit:
+            break
+    return results
+
+
+def search_vault(paths: dict, query: str = '', refresh: bool = True, **filters) -> list[dict]:
+    """Sync the vault's mirror (unless refresh=False) and run a query. See search()."""
+    db = open_mirror(get_mirror_path(paths))
+    try:
+        if refresh:
+            sync_mirror(db, paths)
+        return search(db, query, **filters)
+    finally:
+        db.close()
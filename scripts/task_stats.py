@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Completion statistics over the tasks folder and the archive.
+
+Completions are streamed one at a time and folded into per-week counters
+and lateness histograms (completed - due, in days), so memory depends on
+the number of weeks and distinct lateness values, not on archive size.
+Archived files are read header-only, or served from the SQLite mirror
+(see task_mirror) when one exists. Recurring tasks are never archived;
+their completions are the dated entries of their ## History sections.
+"""
+
+import os
+import re
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+from task_utils import date_ordinal, history_entries, read_frontmatter, read_text, write_file
+
+# Leading date of a ## History entry, e.g. "- 2025-01-15: Completed" or "- [[2025-01-15]]"
+HISTORY_DATE = re.compile(r'\[*([0-9]{1,4}[-/][0-9]{1,2}[-/][0-9]{1,4})')
+
+
+def week_start(ordinal: int) -> int:
+    """Ordinal of the Sunday starting the week that holds a date ordinal."""
+    # date.fromordinal(1) is a Monday, so Sundays are the multiples of 7
+    return ordinal - ordinal % 7
+
+
+def iter_archive_headers(completed_dir: Path):
+    """Yield (completed, due, recurring) from the header of every archived file with a completed date."""
+    folders = [completed_dir]
+    while folders:
+        try:
+            it = os.scandir(folders.pop())
+        except FileNotFoundError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir():
+                    folders.append(entry.path)
+                elif entry.name.endswith('.md'):
+                    try:
+                        frontmatter = read_frontmatter(entry.path)
+                    except (OSError, UnicodeDecodeError):
+                        continue
+                    completed = date_ordinal(frontmatter.get('completed'))
+                    if completed is not None:
+                        yield completed, date_ordinal(frontmatter.get('due')), bool(frontmatter.get('recurrence'))
+
+
+def iter_mirror_completions(paths: dict):
+    """Yield (completed, due, recurring) for archived files from the synced mirror."""
+    from task_mirror import get_mirror_path, open_mirror, sync_mirror
+
+    db = open_mirror(get_mirror_path(paths))
+    try:
+        sync_mirror(db, paths)
+        rows = db.execute('SELECT completed, due, recurrence IS NOT NULL FROM tasks '
+                          'WHERE archived = 1 AND completed IS NOT NULL')
+        for completed, due, recurring in rows:
+            yield completed, due, bool(recurring)
+    finally:
+        db.close()
+
+
+def iter_completions(tasks: list, paths: dict, use_mirror: bool = False):
+    """Yield (completed ordinal, due ordinal or None, recurring) for every completion.
+
+    tasks are the scanned tasks folder: its not-yet-archived completed tasks
+    and the ## History dates of its recurring tasks (which have no due date
+    to measure lateness against). The archive comes from the mirror with
+    use_mirror, otherwise from file headers.
+    """
+    for task in tasks:
+        if task.completed_ordinal is not None:
+            yield task.completed_ordinal, task.due_ordinal, bool(task.recurrence)
+        elif task.recurrence:
+            try:
+                entries = history_entries(read_text(task.path)) or []
+            except (OSError, UnicodeDecodeError):
+                continue
+            for entry in entries:
+                match = HISTORY_DATE.match(entry)
+                completed = date_ordinal(match.group(1)) if match else None
+                if completed is not None:
+                    yield completed, None, True
+
+    if use_mirror:
+        yield from iter_mirror_completions(paths)
+    else:
+        yield from iter_archive_headers(paths['completed'])
+
+
+def new_week() -> dict:
+    return {'one_time': 0, 'recurring': 0, 'lateness': Counter()}
+
+
+def completion_stats(completions, first: date | None = None, last: date | None = None) -> dict:
+    """Fold (completed, due, recurring) tuples into totals and per-week counts in one pass.
+
+    Completions outside first..last (inclusive) are skipped. Returns
+    {'total': week, 'weeks': {week start ordinal: week}, 'first', 'last'}
+    where each week is {'one_time', 'recurring', 'lateness': Counter of
+    days late (negative when early)}; first/last are the earliest and
+    latest completion ordinals seen.
+    """
+    low = first.toordinal() if first else None
+    high = last.toordinal() if last else None
+    total = new_week()
+    weeks = {}
+    seen_first = seen_last = None
+
+    for completed, due, recurring in completions:
+        if (low is not None and completed < low) or (high is not None and completed > high):
+            continue
+        week = weeks.get(week_start(completed))
+        if week is None:
+            week = weeks[week_start(completed)] = new_week()
+        kind = 'recurring' if recurring else 'one_time'
+        week[kind] += 1
+        total[kind] += 1
+        if due is not None:
+            week['lateness'][completed - due] += 1
+            total['lateness'][completed - due] += 1
+        if seen_first is None or completed < seen_first:
+            seen_first = completed
+        if seen_last is None or completed > seen_last:
+            seen_last = completed
+
+    return {'total': total, 'weeks': weeks, 'first': seen_first, 'last': seen_last}
+
+
+def histogram_median(histogram: Counter) -> float | None:
+    """Median of the values counted in a histogram."""
+    count = sum(histogram.values())
+    if not count:
+        return None
+    middle = [(count - 1) // 2, count // 2]
+    found = []
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        while middle and middle[0] < seen:
+            found.append(value)
+            middle.pop(0)
+        if not middle:
+            break
+    return sum(found) / 2
+
+
+def format_lateness(days: float | None) -> str:
+    if days is None:
+        return '—'
+    if days == 0:
+        return 'on time'
+    amount = f"{abs(days):g} day{'' if abs(days) == 1 else 's'}"
+    return f"{amount} late" if days > 0 else f"{amount} early"
+
+
+def render_stats(stats: dict, today: date) -> str:
+    """Markdown report: summary, then one row per week (newest first, empty weeks included)."""
+    total = stats['total']
+    count = total['one_time'] + total['recurring']
+    lines = ["# Completion Stats", ""]
+    if not count:
+        lines.append("No completed tasks.")
+        return '\n'.join(lines) + '\n'
+
+    first, last = stats['first'], stats['last']
+    week_count = (week_start(last) - week_start(first)) // 7 + 1
+    with_due = sum(total['lateness'].values())
+    on_time = sum(n for days, n in total['lateness'].items() if days <= 0)
+
+    lines.append(f"Completions from {date.fromordinal(first).isoformat()} to {date.fromordinal(last).isoformat()}, "
+                 f"as of {today.isoformat()}.")
+    lines.append("")
+    lines.append("## Summary")
+    lines.append("")
+    lines.append(f"- Completed: {count} ({total['one_time']} one-time, {total['recurring']} recurring)")
+    lines.append(f"- Per week: {count / week_count:.1f} on average over {week_count} week(s)")
+    if with_due:
+        lines.append(f"- Median lateness: {format_lateness(histogram_median(total['lateness']))} "
+                     f"({on_time / with_due:.0%} on time or early, of {with_due} with a due date)")
+    lines.append("")
+    lines.append("## By Week")
+    lines.append("")
+    lines.append("| Week of | Completed | One-time | Recurring | Median lateness |")
+    lines.append("| --- | ---: | ---: | ---: | --- |")
+    for start in range(week_start(last), week_start(first) - 1, -7):
+        week = stats['weeks'].get(start) or new_week()
+        lines.append(f"| {date.fromordinal(start).isoformat()} | {week['one_time'] + week['recurring']} "
+                     f"| {week['one_time']} | {week['recurring']} "
+                     f"| {format_lateness(histogram_median(week['lateness']))} |")
+    return '\n'.join(lines) + '\n'
+
+
+def generate_stats_report(tasks: list, paths: dict, today: date, output_path: Path, use_mirror: bool = False,
+                          first: date | None = None, last: date | None = None) -> dict:
+    """Compute completion stats in one streaming pass and write the report. Returns the stats."""
+    stats = completion_stats(iter_completions(tasks, paths, use_mirror), first, last)
+    write_file(output_path, render_stats(stats, today))
+    return stats
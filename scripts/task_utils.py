@@ -1,21 +1,165 @@
 #!/usr/bin/env python3
 """Shared utilities for task management scripts."""
 
+import hashlib
+import json
+import os
 import re
-import yaml
-from datetime import datetime, timedelta
+import threading
+from array import array
+from functools import lru_cache
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
 
 CONFIG_PATH = Path.home() / ".claude" / "task-management-config" / "config.yaml"
+CACHE_DIR = CONFIG_PATH.parent / "cache"
+CONFIG_CACHE_PATH = CACHE_DIR / "config.json"
+
+# PyYAML, shutil and concurrent.futures are imported inside the functions that
+# need them: most runs never touch them, and each costs startup time.
+
+INDEX_VERSION = 2
+
+# Archive manifest, kept in the completed folder so it syncs with the vault.
+ARCHIVE_MANIFEST = '.archive-index.json'
+ARCHIVE_MANIFEST_VERSION = 1
+
+# Date formats accepted in frontmatter: name -> (pattern, (year, month, day) groups).
+DATE_PATTERNS = {
+    'iso': (re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})'), (1, 2, 3)),
+    'ymd-slash': (re.compile(r'(\d{4})/(\d{1,2})/(\d{1,2})'), (1, 2, 3)),
+    'mdy-slash': (re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})'), (3, 1, 2)),
+    'dmy-slash': (re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})'), (3, 2, 1)),
+}
+# Candidates by the character after a 4-digit year ('/' also covers m/d/Y).
+# Month-first is tried before day-first, so 03/04/2025 is March 4.
+DATE_FORMAT_CANDIDATES = {
+    '-': ('iso',),
+    '/': ('ymd-slash', 'mdy-slash', 'dmy-slash'),
+}
+
+# Frontmatter parsing
+NOT_SIMPLE = object()
+# Plain words that YAML 1.1 resolves to booleans or null rather than strings.
+YAML_SPECIAL_WORDS = frozenset(
+    'yes Yes YES no No NO true True TRUE false False FALSE on On ON off Off OFF null Null NULL'.split()
+)
+SIMPLE_KEY_LINE = re.compile(r'([A-Za-z_][A-Za-z0-9_-]*):(?: +(.*))?')
+SIMPLE_WORD = re.compile(r'[A-Za-z_][A-Za-z0-9_./-]*(?: +[A-Za-z0-9_./-]+)*')
+SIMPLE_INT = re.compile(r'[-+]?(?:0|[1-9][0-9]*)')
+SIMPLE_DATE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
+SIMPLE_STRING_DATE = re.compile(r'[0-9]{1,2}/[0-9]{1,2}/[0-9]{4}|[0-9]{4}/[0-9]{1,2}/[0-9]{1,2}|[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}')
+
+# Counts of write_file() calls that hit the disk vs. found identical content.
+WRITE_STATS = {'written': 0, 'skipped': 0}
+
+# I/O and parsing counters for --timings (see task_profile.py). Bytes read
+# by header-only reads count only the header.
+IO_STATS = {
+    'stat': 0, 'read': 0, 'written': 0, 'bytes_read': 0, 'bytes_written': 0,
+    'fast_parses': 0, 'yaml_parses': 0, 'index_hits': 0, 'index_misses': 0,
+}
+IO_STATS_LOCK = threading.Lock()
+
+# Below this many files to read, thread start-up costs more than it saves.
+PARALLEL_SCAN_MIN_FILES = 64
+
+# Delimit the generated task list in daily/weekly notes (see update_task_block)
+TASK_BLOCK_START = '<!-- tasks:start -->'
+TASK_BLOCK_END = '<!-- tasks:end -->'
+
+# A heading of a rendered view (today, this week, next week)
+VIEW_HEADING = re.compile(
+    r'## (?:Overdue|Due Today|(?:Sun|Mon|Tues|Wednes|Thurs|Fri|Satur)day, [A-Z][a-z]+ \d{1,2})[ \t]*\r?'
+)
+
+# recurrence value -> (unit, step) for projecting future instances
+RECURRENCE_STEPS = {
+    'weekly': ('days', 7),
+    'biweekly': ('days', 14),
+    'monthly': ('months', 1),
+    'quarterly': ('months', 3),
+    'yearly': ('months', 12),
+}
+
+# A recurring task's ## History section (up to the next heading) and its list entries
+HISTORY_HEADING = re.compile(r'^## History[ \t]*$', re.M)
+NEXT_HEADING = re.compile(r'^#{1,2} ', re.M)
+HISTORY_ENTRY = re.compile(r'^\s*[-*] +(.*)$', re.M)
+
+
+class FrontmatterError(ValueError):
+    """Frontmatter that is not valid YAML."""
 
 
 def load_config():
-    """Load configuration from config file."""
+    """Load configuration from config file.
+
+    The parsed config is cached as JSON, keyed by the file's mtime and size,
+    so most runs don't need to import PyYAML.
+    """
     if not CONFIG_PATH.exists():
         raise FileNotFoundError(f"Config file not found: {CONFIG_PATH}")
+
+    st = CONFIG_PATH.stat()
+    key = [st.st_mtime_ns, st.st_size]
+    try:
+        with open(CONFIG_CACHE_PATH, 'r') as f:
+            cached = json.load(f)
+        if cached['key'] == key:
+            return cached['config']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    import yaml
+
     with open(CONFIG_PATH, 'r') as f:
-        return yaml.safe_load(f)
+        config = yaml.safe_load(f)
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = CONFIG_CACHE_PATH.with_name(f".{CONFIG_CACHE_PATH.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({'key': key, 'config': config}, f, default=str)
+        os.replace(tmp_path, CONFIG_CACHE_PATH)
+    except OSError:
+        pass
+    return config
+
+
+def vault_configs(config: dict) -> dict:
+    """Split a config into one config per vault, keyed by vault name (in config order).
+
+    A config with a `vaults:` list gets one entry per vault: its vault_root,
+    plus any per-vault sections (folders, generated_files, cache, ...)
+    merged over the top-level ones. A config without `vaults:` is a single
+    vault named 'default'.
+    """
+    if not config.get('vaults'):
+        return {'default': config}
+
+    base = {key: value for key, value in config.items() if key != 'vaults'}
+    vaults = {}
+    for entry in config['vaults']:
+        if not isinstance(entry, dict) or not entry.get('vault_root'):
+            raise ValueError(f"Each entry under vaults: needs a vault_root, got {entry!r}")
+        name = str(entry.get('name') or Path(entry['vault_root']).expanduser().name)
+        if name in vaults:
+            raise ValueError(f"Duplicate vault name {name!r}; give each vault a distinct name")
+
+        vault = dict(base)
+        for key, value in entry.items():
+            if key in ('name', 'vault_root'):
+                continue
+            if isinstance(value, dict) and isinstance(base.get(key), dict):
+                vault[key] = {**base[key], **value}
+            else:
+                vault[key] = value
+        vault['paths'] = {**base.get('paths', {}), 'vault_root': entry['vault_root']}
+        vaults[name] = vault
+    return vaults
 
 
 def get_paths(config):
@@ -23,10 +167,12 @@ def get_paths(config):
     vault_root = Path(config['paths']['vault_root']).expanduser()
     folders = config.get('folders', {})
     generated = config.get('generated_files', {})
+    tasks_dir = vault_root / folders.get('tasks', 'notes/tasks')
+    use_index = config.get('cache', {}).get('enabled', True)
 
     return {
         'vault_root': vault_root,
-        'tasks': vault_root / folders.get('tasks', 'notes/tasks'),
+        'tasks': tasks_dir,
         'completed': vault_root / folders.get('completed', 'notes/tasks/completed'),
         'daily': vault_root / folders.get('daily', 'notes/daily'),
         'weekly': vault_root / folders.get('weekly', 'notes/weekly'),
@@ -34,9 +180,215 @@ def get_paths(config):
         'today_file': vault_root / generated.get('today', 'notes/today.md'),
         'this_week_file': vault_root / generated.get('this_week', 'notes/this-week.md'),
         'next_week_file': vault_root / generated.get('next_week', 'notes/next-week.md'),
+        'tags_dir': vault_root / generated.get('tags', 'notes/tags'),
+        'stats_file': vault_root / generated.get('stats', 'notes/task-stats.md'),
+        'index': get_index_path(tasks_dir) if use_index else None,
     }
 
 
+def get_cache_path(tasks_dir: Path, kind: str, suffix: str) -> Path:
+    """Get a per-vault cache file, keyed by the tasks folder's resolved path."""
+    key = hashlib.sha1(str(tasks_dir.expanduser().resolve()).encode()).hexdigest()[:16]
+    return CACHE_DIR / f"{kind}-{key}.{suffix}"
+
+
+def get_index_path(tasks_dir: Path) -> Path:
+    """Get the frontmatter index file for a tasks folder (one per vault)."""
+    return get_cache_path(tasks_dir, 'index', 'json')
+
+
+def load_index(index_path: Path) -> dict:
+    """Load cached index entries, or an empty index if missing or stale."""
+    try:
+        with open(index_path, 'r') as f:
+            text = f.read()
+        count_io(read=1, bytes_read=len(text))
+        data = json.loads(text)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get('version') != INDEX_VERSION:
+        return {}
+    return data.get('entries', {})
+
+
+def save_index(index_path: Path, entries: dict):
+    """Write index entries atomically so a crashed run never leaves a torn file."""
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+    text = json.dumps({'version': INDEX_VERSION, 'entries': entries}, default=str, separators=(',', ':'))
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, index_path)
+    count_io(written=1, bytes_written=len(text))
+
+
+def count_io(**counts):
+    """Add to IO_STATS (safe to call from scan worker threads)."""
+    with IO_STATS_LOCK:
+        for key, n in counts.items():
+            IO_STATS[key] += n
+
+
+def read_text(path: Path) -> str:
+    """Read a whole file as text, counting it in IO_STATS."""
+    text = path.read_text()
+    count_io(read=1, bytes_read=len(text))
+    return text
+
+
+def write_file(path: Path, content: str | bytes) -> bool:
+    """Write content unless the file already holds exactly that. Returns True if written.
+
+    Unchanged files are left alone (no mtime bump, so Obsidian and sync
+    clients don't see a change). Real writes go to a temp file that is then
+    renamed over the target, so readers never see a half-written file.
+    """
+    data = content if isinstance(content, bytes) else content.encode('utf-8')
+    count_io(stat=1)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        st = None
+
+    if st is not None and st.st_size == len(data):
+        count_io(read=1, bytes_read=len(data))
+        if hashlib.sha1(path.read_bytes()).digest() == hashlib.sha1(data).digest():
+            with IO_STATS_LOCK:
+                WRITE_STATS['skipped'] += 1
+            return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        if st is not None:
+            os.chmod(tmp_path, st.st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    with IO_STATS_LOCK:
+        WRITE_STATS['written'] += 1
+    count_io(written=1, bytes_written=len(data))
+    return True
+
+
+def parse_scalar(value: str):
+    """Resolve a simple YAML scalar the way yaml.safe_load would.
+
+    Returns NOT_SIMPLE for anything outside the handful of forms task
+    headers actually use, so the caller can fall back to a real YAML parser.
+    """
+    if not value:
+        return None
+    if SIMPLE_WORD.fullmatch(value):
+        return NOT_SIMPLE if value in YAML_SPECIAL_WORDS else value
+    if SIMPLE_INT.fullmatch(value):
+        return int(value)
+    if SIMPLE_DATE.fullmatch(value):
+        try:
+            return date(int(value[:4]), int(value[5:7]), int(value[8:10]))
+        except ValueError:
+            return NOT_SIMPLE
+    if SIMPLE_STRING_DATE.fullmatch(value):
+        return value
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '\'"':
+        inner = value[1:-1]
+        if "'" not in inner and '"' not in inner and '\\' not in inner:
+            return inner
+    return NOT_SIMPLE
+
+
+def parse_simple_header(text: str):
+    """Parse a flat `key: scalar` header with optional simple lists, without YAML.
+
+    Handles scalars (see parse_scalar), `key: [a, b]` flow lists and
+    `key:` followed by `- item` lines. Returns NOT_SIMPLE for anything else
+    (nested maps, comments after values, anchors, tabs, non-ASCII, ...).
+    """
+    if not text.isascii() or '\t' in text:
+        return NOT_SIMPLE
+    if '\r' in text:
+        text = text.replace('\r\n', '\n')
+        if '\r' in text:
+            return NOT_SIMPLE
+
+    result = {}
+    list_key = None
+    list_indent = None
+    for line in text.split('\n'):
+        stripped = line.strip(' ')
+        if not stripped or line.startswith('#'):
+            continue
+
+        if list_key is not None and stripped.startswith('- '):
+            indent = len(line) - len(line.lstrip(' '))
+            if list_indent is None:
+                list_indent = indent
+            elif indent != list_indent:
+                return NOT_SIMPLE
+            item = parse_scalar(stripped[2:].strip(' '))
+            if item is NOT_SIMPLE or item is None:
+                return NOT_SIMPLE
+            if result[list_key] is None:
+                result[list_key] = []
+            result[list_key].append(item)
+            continue
+
+        match = SIMPLE_KEY_LINE.fullmatch(line)
+        if not match or match.group(1) in YAML_SPECIAL_WORDS:
+            return NOT_SIMPLE
+        key, value = match.group(1), (match.group(2) or '').strip(' ')
+
+        list_key = list_indent = None
+        if not value:
+            result[key] = None
+            list_key = key
+        elif value[0] == '[':
+            if value[-1] != ']':
+                return NOT_SIMPLE
+            inner = value[1:-1].strip(' ')
+            items = [parse_scalar(item.strip(' ')) for item in inner.split(',')] if inner else []
+            if any(item is NOT_SIMPLE or item is None for item in items):
+                return NOT_SIMPLE
+            result[key] = items
+        else:
+            scalar = parse_scalar(value)
+            if scalar is NOT_SIMPLE:
+                return NOT_SIMPLE
+            result[key] = scalar
+
+    # Like yaml.safe_load, a header with no keys is None
+    return result or None
+
+
+def load_frontmatter_yaml(text: str):
+    """Parse frontmatter YAML: simple headers by hand, the rest with libyaml if installed.
+
+    Gives the same result as yaml.safe_load(text). Invalid YAML raises
+    FrontmatterError; impossible dates raise ValueError, as in PyYAML.
+    """
+    frontmatter = parse_simple_header(text)
+    if frontmatter is not NOT_SIMPLE:
+        count_io(fast_parses=1)
+    else:
+        import yaml
+
+        count_io(yaml_parses=1)
+
+        # libyaml's loader is several times faster, but accepts tabs where
+        # PyYAML raises; keep PyYAML's behaviour there
+        loader = yaml.SafeLoader if '\t' in text else getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        try:
+            frontmatter = yaml.load(text, Loader=loader)
+        except yaml.YAMLError as e:
+            raise FrontmatterError(str(e)) from e
+    return frontmatter
+
+
 def parse_frontmatter(content: str) -> tuple[dict, str]:
     """Parse YAML frontmatter from markdown content."""
     if not content.startswith('---'):
@@ -47,13 +399,70 @@ def parse_frontmatter(content: str) -> tuple[dict, str]:
         return {}, content
 
     try:
-        frontmatter = yaml.safe_load(parts[1]) or {}
+        frontmatter = load_frontmatter_yaml(parts[1]) or {}
         body = parts[2].lstrip('\n')
         return frontmatter, body
-    except yaml.YAMLError:
+    except ValueError:  # FrontmatterError, or impossible dates like 2025-13-01
         return {}, content
 
 
+def read_frontmatter(file_path: Path) -> dict:
+    """Read only the YAML frontmatter of a file, stopping at the closing '---'.
+
+    Equivalent to parse_frontmatter(file_path.read_text())[0], but the body is
+    never read, so a task with a long history costs the same as a short one.
+    """
+    with open(file_path, 'r') as f:
+        line = f.readline()
+        consumed = len(line)
+        if not line.startswith('---'):
+            count_io(read=1, bytes_read=consumed)
+            return {}
+
+        header = []
+        line = line[3:]
+        while line:
+            end = line.find('---')
+            if end != -1:
+                header.append(line[:end])
+                break
+            header.append(line)
+            line = f.readline()
+            consumed += len(line)
+        else:
+            # No closing delimiter
+            count_io(read=1, bytes_read=consumed)
+            return {}
+    count_io(read=1, bytes_read=consumed)
+
+    try:
+        return load_frontmatter_yaml(''.join(header)) or {}
+    except ValueError:  # FrontmatterError, or impossible dates like 2025-13-01
+        return {}
+
+
+@lru_cache(maxsize=65536)
+def parse_date_string(date_str: str) -> tuple[str | None, str]:
+    """Parse a date string. Returns (YYYY-MM-DD or None, name of the format seen).
+
+    The separator and field widths pick the candidate patterns, so every
+    input costs at most two regex matches; results are memoized because a
+    vault repeats the same few thousand date strings.
+    """
+    for fmt in DATE_FORMAT_CANDIDATES.get(date_str[4:5] if date_str[4:5] in '-/' else '/', ()):
+        match = DATE_PATTERNS[fmt][0].fullmatch(date_str)
+        if not match:
+            continue
+        year, month, day = (int(match.group(i)) for i in DATE_PATTERNS[fmt][1])
+        try:
+            normalized = date(year, month, day).isoformat()
+        except ValueError:
+            continue
+        return normalized, 'canonical' if normalized == date_str else fmt
+
+    return None, 'unparseable'
+
+
 def normalize_date(date_val) -> str | None:
     """Normalize a date value to YYYY-MM-DD format."""
     if date_val is None:
@@ -62,20 +471,36 @@ def normalize_date(date_val) -> str | None:
     if isinstance(date_val, datetime):
         return date_val.strftime('%Y-%m-%d')
 
-    date_str = str(date_val).strip()
+    if isinstance(date_val, date):
+        return date_val.isoformat()
 
-    if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-        return date_str
+    return parse_date_string(str(date_val).strip())[0]
 
-    formats = ['%Y-%m-%d', '%Y/%m/%d', '%m/%d/%Y', '%d/%m/%Y']
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(date_str, fmt)
-            return dt.strftime('%Y-%m-%d')
-        except ValueError:
-            continue
 
-    return None
+def date_format_of(date_val) -> str | None:
+    """Name of the format a raw frontmatter date was written in (None if absent)."""
+    if date_val is None:
+        return None
+    return parse_date_string(str(date_val).strip())[1]
+
+
+def count_date_formats(tasks: list) -> dict:
+    """Count the due-date formats used across tasks, e.g. {'canonical': 950, 'mdy-slash': 3}."""
+    counts = defaultdict(int)
+    for task in tasks:
+        fmt = date_format_of(task.raw_due)
+        if fmt:
+            counts[fmt] += 1
+    return dict(counts)
+
+
+def noncanonical_dates(tasks: list) -> list[tuple[str, str, str | None]]:
+    """Tasks whose due date isn't written as YYYY-MM-DD: (name, raw value, normalized or None)."""
+    report = []
+    for task in sorted(tasks, key=lambda t: t.name):
+        if task.raw_due is not None and date_format_of(task.raw_due) != 'canonical':
+            report.append((task.name, task.raw_due, task.due))
+    return report
 
 
 def get_task_name(file_path: Path) -> str:
@@ -93,35 +518,521 @@ def get_week_bounds(date: datetime) -> tuple[datetime, datetime]:
     return sunday, saturday
 
 
-def scan_tasks(tasks_dir: Path) -> list[dict]:
-    """Scan all task files and return task info."""
+def date_ordinal(date_val) -> int | None:
+    """Normalize a date value and return its proleptic ordinal (date.toordinal)."""
+    date_str = normalize_date(date_val)
+    if date_str is None:
+        return None
+    try:
+        return date.fromisoformat(date_str).toordinal()
+    except ValueError:
+        return None
+
+
+def ordinal_to_str(ordinal: int | None) -> str | None:
+    """Format a date ordinal as YYYY-MM-DD."""
+    if ordinal is None:
+        return None
+    return date.fromordinal(ordinal).isoformat()
+
+
+# Keys served by Task's dict-style access, for callers written against dict records.
+TASK_KEYS = frozenset((
+    'path', 'name', 'due', 'completed', 'recurrence', 'recurrence_day', 'tags',
+    'frontmatter', 'body', 'content',
+))
+
+
+class Task:
+    """A scanned task file.
+
+    Due and completed dates are stored as date ordinals. The full frontmatter
+    and body are not kept after scanning; they are read from disk the first
+    time they are accessed.
+    """
+
+    __slots__ = (
+        'path', 'name', 'due_ordinal', 'completed_ordinal', 'raw_due',
+        'recurrence', 'recurrence_day', 'tags', '_frontmatter', '_body',
+    )
+
+    def __init__(self, path: Path, due_ordinal=None, completed_ordinal=None, raw_due=None,
+                 recurrence=None, recurrence_day=None, tags=None):
+        self.path = path
+        self.name = get_task_name(path)
+        self.due_ordinal = due_ordinal
+        self.completed_ordinal = completed_ordinal
+        self.raw_due = raw_due
+        self.recurrence = recurrence
+        self.recurrence_day = recurrence_day
+        self.tags = tags
+        self._frontmatter = None
+        self._body = None
+
+    @classmethod
+    def from_frontmatter(cls, path: Path, frontmatter: dict) -> 'Task':
+        """Build a Task from parsed frontmatter."""
+        due = frontmatter.get('due')
+        return cls(
+            path,
+            date_ordinal(due),
+            date_ordinal(frontmatter.get('completed')),
+            None if due is None else str(due),
+            frontmatter.get('recurrence'),
+            frontmatter.get('recurrence_day'),
+            frontmatter.get('tags'),
+        )
+
+    @property
+    def due(self) -> str | None:
+        """Due date as YYYY-MM-DD."""
+        return ordinal_to_str(self.due_ordinal)
+
+    @property
+    def completed(self) -> str | None:
+        """Completed date as YYYY-MM-DD."""
+        return ordinal_to_str(self.completed_ordinal)
+
+    @property
+    def frontmatter(self) -> dict:
+        """Full frontmatter, loaded on first access."""
+        self.load()
+        return self._frontmatter
+
+    @property
+    def body(self) -> str:
+        """Markdown body after the frontmatter, loaded on first access."""
+        self.load()
+        return self._body
+
+    @property
+    def content(self) -> str:
+        """Raw file content (always read fresh)."""
+        return read_text(self.path)
+
+    def load(self):
+        """Read the file and keep its frontmatter and body."""
+        if self._body is None:
+            self._frontmatter, self._body = parse_frontmatter(read_text(self.path))
+
+    def __getitem__(self, key):
+        if key not in TASK_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in TASK_KEYS:
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in TASK_KEYS
+
+    def keys(self):
+        return TASK_KEYS
+
+    def __repr__(self):
+        return f"Task({self.name!r}, due={self.due!r}, completed={self.completed!r})"
+
+
+def history_entries(content: str) -> list[str] | None:
+    """Text of each list entry under a task's ## History heading, or None if it has none."""
+    heading = HISTORY_HEADING.search(content)
+    if heading is None:
+        return None
+    end = NEXT_HEADING.search(content, heading.end())
+    return HISTORY_ENTRY.findall(content, heading.end(), end.start() if end else len(content))
+
+
+def parse_task_file(task_file: Path) -> Task:
+    """Read a task's frontmatter into a Task."""
+    return Task.from_frontmatter(task_file, read_frontmatter(task_file))
+
+
+def get_scan_workers(config: dict) -> int:
+    """Get the configured scan thread count (scan.workers); 0 or 1 scans serially."""
+    return int(config.get('scan', {}).get('workers', 0) or 0)
+
+
+def scan_tasks(tasks_dir: Path, index_path: Path | None = None, workers: int = 0) -> list[Task]:
+    """Scan all task files and return them as Task records.
+
+    Only frontmatter is read; bodies load lazily (see Task). With an
+    index_path, files whose stat (mtime_ns, size, inode) is unchanged since
+    the last scan are served from the on-disk index instead of being re-read.
+
+    With workers > 1, files that need reading are parsed on a thread pool
+    (worthwhile on network or synced filesystems). Results keep directory
+    order, so the output is identical to a serial scan.
+    """
     tasks = []
 
     if not tasks_dir.exists():
         return tasks
 
-    for task_file in tasks_dir.glob('*.md'):
-        content = task_file.read_text()
-        frontmatter, body = parse_frontmatter(content)
-
-        due = normalize_date(frontmatter.get('due'))
-        completed = normalize_date(frontmatter.get('completed'))
-        recurrence = frontmatter.get('recurrence')
-
-        tasks.append({
-            'path': task_file,
-            'name': get_task_name(task_file),
-            'due': due,
-            'completed': completed,
-            'recurrence': recurrence,
-            'frontmatter': frontmatter,
-            'body': body,
-            'content': content,
-        })
+    cached = load_index(index_path) if index_path else {}
+    entries = {}
+
+    files = []
+    with os.scandir(tasks_dir) as it:
+        for entry in it:
+            if not entry.name.endswith('.md') or not entry.is_file():
+                continue
+            st = entry.stat()
+            files.append((entry.name, Path(entry.path), [st.st_mtime_ns, st.st_size, st.st_ino]))
+
+    misses = [(name, task_file) for name, task_file, stat_key in files
+              if not (name in cached and cached[name][0] == stat_key)]
+    count_io(stat=len(files), index_hits=len(files) - len(misses), index_misses=len(misses))
+    if workers > 1 and len(misses) >= PARALLEL_SCAN_MIN_FILES:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(parse_task_file, [task_file for _, task_file in misses])
+            parsed = dict(zip([name for name, _ in misses], results))
+    else:
+        parsed = {name: parse_task_file(task_file) for name, task_file in misses}
+
+    for name, task_file, stat_key in files:
+        task = parsed.get(name)
+        if task is None:
+            task = Task(task_file, *cached[name][1:])
+
+        if index_path:
+            entries[name] = [
+                stat_key, task.due_ordinal, task.completed_ordinal, task.raw_due,
+                task.recurrence, task.recurrence_day, task.tags,
+            ]
+
+        tasks.append(task)
+
+    # Entries for deleted files fall out because only live files are re-added.
+    if index_path and entries != cached:
+        save_index(index_path, entries)
 
     return tasks
 
 
+def list_vault_files(paths: dict, archived: bool = True) -> dict:
+    """Stat every task file (and archived task file, unless archived=False).
+
+    Returns {path relative to the vault: (path as a str, (mtime_ns, size,
+    inode), archived)}. Like scan_tasks, only the top level of the tasks
+    folder is read; the completed folder is walked recursively. Paths stay
+    strings so callers only pay for Path objects on files they read.
+    """
+    vault_root = paths['vault_root']
+    files = {}
+
+    def walk(folder: Path, in_archive: bool):
+        try:
+            it = os.scandir(folder)
+        except FileNotFoundError:
+            return
+        prefix = os.path.relpath(folder, vault_root)
+        prefix = '' if prefix == '.' else prefix + os.sep
+        with it:
+            for entry in it:
+                if entry.name.endswith('.md') and entry.is_file():
+                    st = entry.stat()
+                    files[prefix + entry.name] = (entry.path, (st.st_mtime_ns, st.st_size, st.st_ino), in_archive)
+                elif in_archive and entry.is_dir():
+                    walk(entry.path, in_archive)
+
+    walk(paths['tasks'], False)
+    if archived:
+        walk(paths['completed'], True)
+    count_io(stat=len(files))
+    return files
+
+
+def read_header_from(f) -> bytes:
+    """Raw header bytes from an open binary file positioned at its start (see read_header_bytes)."""
+    header = f.readline()
+    if not header.startswith(b'---') or header.find(b'---', 3) != -1:
+        return header
+    for line in f:
+        header += line
+        if b'---' in line:
+            break
+    return header
+
+
+def read_header_bytes(file_path: Path) -> bytes:
+    """Raw bytes from the start of a file through the end of its frontmatter.
+
+    Stops at the line holding the closing '---' (the whole file if there is
+    none), so the body is not read.
+    """
+    with open(file_path, 'rb') as f:
+        header = read_header_from(f)
+    count_io(read=1, bytes_read=len(header))
+    return header
+
+
+def find_frontmatter_value(header: bytes, key: str) -> tuple[int, int] | None:
+    """Byte span of a top-level `key: value` in a frontmatter header, or None.
+
+    The span covers the value only (quotes included), not the key, any
+    trailing comment or the line ending.
+    """
+    end = header.find(b'---', 3)
+    if not header.startswith(b'---') or end == -1:
+        return None
+    pattern = re.compile(rb'^' + re.escape(key.encode()) + rb':[ \t]*([^#\r\n]*?)[ \t]*(?:#[^\r\n]*)?\r?$', re.M)
+    match = pattern.search(header, 3, end)
+    if not match or match.start(1) == match.end(1):
+        return None
+    return match.span(1)
+
+
+def patch_file_frontmatter(path: Path, values: dict) -> bool:
+    """Replace the values of top-level `key:` lines in one file (see patch_frontmatter).
+
+    The header is read once. Same-length values are written in place, so
+    the write is just those bytes; a longer or shorter value means reading
+    the rest of the file and rewriting it atomically through write_file.
+    Returns False, writing nothing, if a key is not a simple one-line value.
+    """
+    with open(path, 'r+b') as f:
+        header = read_header_from(f)
+        count_io(read=1, bytes_read=len(header))
+        spans = []
+        for key, value in values.items():
+            span = find_frontmatter_value(header, key)
+            if span is None:
+                return False
+            spans.append((span, str(value).encode('utf-8')))
+
+        if all(end - start == len(new) for (start, end), new in spans):
+            for (start, _), new in spans:
+                f.seek(start)
+                f.write(new)
+            with IO_STATS_LOCK:
+                WRITE_STATS['written'] += 1
+            count_io(written=1, bytes_written=sum(len(new) for _, new in spans))
+            return True
+
+        rest = f.read()
+        count_io(read=1, bytes_read=len(rest))
+    data = header
+    for (start, end), new in sorted(spans, reverse=True):
+        data = data[:start] + new + data[end:]
+    write_file(path, data + rest)
+    return True
+
+
+def patch_frontmatter(edits: dict, workers: int = 0) -> dict:
+    """Apply frontmatter edits in one write phase: {path: {key: new value}}.
+
+    Only the value bytes of each `key:` line change; key order, quoting of
+    other keys, comments and the body stay byte-for-byte the same. Task
+    files are the user's own notes rather than generated files, so a
+    same-length value is overwritten in place (a reader racing it can see
+    a mix of the old and new value, never a short file). With workers > 1
+    the files are patched on a thread pool. Returns {path: False} for files
+    whose keys were not simple one-line values (nothing is written for those).
+    """
+    if workers > 1 and len(edits) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(edits, pool.map(patch_file_frontmatter, edits, edits.values())))
+    return {path: patch_file_frontmatter(path, values) for path, values in edits.items()}
+
+
+def normalize_task_dates(tasks: list[Task], workers: int = 0) -> int:
+    """Normalize dates in task files. Returns count of files updated.
+
+    Edits are collected first and applied together by patch_frontmatter
+    (on `workers` threads), which changes only the due: value. Headers too
+    complex to patch fall back to re-serializing the frontmatter.
+    """
+    # Unparseable values are left for the user to fix (see noncanonical_dates)
+    pending = {task.path: task for task in tasks
+               if task.raw_due is not None and task.due is not None and task.raw_due != task.due}
+
+    results = patch_frontmatter({path: {'due': task.due} for path, task in pending.items()}, workers)
+
+    for path, patched in results.items():
+        task = pending[path]
+        if not patched:
+            import yaml
+
+            frontmatter = task.frontmatter
+            frontmatter['due'] = task.due
+            new_content = '---\n' + yaml.dump(frontmatter, default_flow_style=False) + '---\n' + task.body
+            write_file(path, new_content)
+        task.raw_due = task.due
+
+    return len(results)
+
+
+def archive_shard(completed_dir: Path, completed_ordinal: int) -> Path:
+    """Folder an archived task goes in: completed/YYYY/MM by completion date."""
+    completed = date.fromordinal(completed_ordinal)
+    return completed_dir / f"{completed.year:04d}" / f"{completed.month:02d}"
+
+
+def load_archive_manifest(completed_dir: Path) -> dict:
+    """Load the archive manifest: {archived name: [relative path, task name, completed ordinal]}."""
+    try:
+        with open(completed_dir / ARCHIVE_MANIFEST, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get('version') != ARCHIVE_MANIFEST_VERSION:
+        return {}
+    return data.get('tasks', {})
+
+
+def save_archive_manifest(completed_dir: Path, manifest: dict):
+    """Write the archive manifest next to the archived tasks."""
+    content = json.dumps({'version': ARCHIVE_MANIFEST_VERSION, 'tasks': manifest},
+                         sort_keys=True, separators=(',', ':'))
+    write_file(completed_dir / ARCHIVE_MANIFEST, content)
+
+
+def unique_archive_name(manifest: dict, shard_dir: Path, task_file: Path) -> str:
+    """Pick an archive name that clashes with nothing already archived.
+
+    Obsidian resolves [[links]] by name, so names are kept unique across the
+    whole archive, not just within one folder. Clashes get a -2, -3... suffix.
+    """
+    name = candidate = task_file.stem
+    suffix = 2
+    while candidate in manifest or (
+            (shard_dir / f"{candidate}.md") != task_file and (shard_dir / f"{candidate}.md").exists()):
+        candidate = f"{name}-{suffix}"
+        suffix += 1
+    return candidate
+
+
+def plan_archive(manifest: dict, completed_dir: Path, task_file: Path, completed_ordinal: int | None) -> Path:
+    """Pick a file's archive path and record it in the manifest (nothing is moved yet).
+
+    Files without a completion date stay at the top of the archive folder.
+    """
+    if completed_ordinal is None:
+        shard_dir = completed_dir
+    else:
+        shard_dir = archive_shard(completed_dir, completed_ordinal)
+
+    archived_name = unique_archive_name(manifest, shard_dir, task_file)
+    dest = shard_dir / f"{archived_name}.md"
+    manifest[archived_name] = [dest.relative_to(completed_dir).as_posix(), task_file.stem, completed_ordinal]
+    return dest
+
+
+def move_to_archive(task_file: Path, dest: Path):
+    """Move a file to the path plan_archive picked for it."""
+    if dest != task_file:
+        import shutil
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(task_file), str(dest))
+
+
+def archive_task_file(manifest: dict, completed_dir: Path, task_file: Path, completed_ordinal: int | None) -> Path:
+    """Move one file into the archive and record it in the manifest. Returns its new path."""
+    dest = plan_archive(manifest, completed_dir, task_file, completed_ordinal)
+    move_to_archive(task_file, dest)
+    return dest
+
+
+def is_archivable(task: Task) -> bool:
+    """Completed one-time tasks are archived; recurring tasks never are."""
+    return task.completed_ordinal is not None and not task.recurrence
+
+
+def archive_completed_tasks(tasks: list[Task], completed_dir: Path) -> list[str]:
+    """Move completed one-time tasks to completed/YYYY/MM. Returns list of archived task names."""
+    archived = []
+    manifest = None
+
+    for task in tasks:
+        if is_archivable(task):
+            if manifest is None:
+                manifest = load_archive_manifest(completed_dir)
+            archive_task_file(manifest, completed_dir, task.path, task.completed_ordinal)
+            archived.append(task.name)
+
+    if manifest is not None:
+        save_archive_manifest(completed_dir, manifest)
+
+    return archived
+
+
+def find_archived(completed_dir: Path, name: str) -> list[Path]:
+    """Archived files for a task name, including renamed clashes (name-2, ...)."""
+    manifest = load_archive_manifest(completed_dir)
+    return [completed_dir / entry[0] for archived_name, entry in sorted(manifest.items())
+            if archived_name == name or entry[1] == name]
+
+
+def restore_archived(completed_dir: Path, tasks_dir: Path, name: str) -> Path:
+    """Move an archived task back into the tasks folder under its original name."""
+    manifest = load_archive_manifest(completed_dir)
+    if name not in manifest:
+        raise FileNotFoundError(f"No archived task named {name!r}")
+
+    relative_path, task_name, _ = manifest[name]
+    dest = tasks_dir / f"{task_name}.md"
+    if dest.exists():
+        raise FileExistsError(f"Task already exists: {dest}")
+
+    import shutil
+
+    shutil.move(str(completed_dir / relative_path), str(dest))
+    del manifest[name]
+    save_archive_manifest(completed_dir, manifest)
+    return dest
+
+
+def count_archived(completed_dir: Path) -> dict:
+    """Count archived tasks per YYYY-MM shard (key 'undated' for top-level files)."""
+    counts = defaultdict(int)
+    for _, _, completed_ordinal in load_archive_manifest(completed_dir).values():
+        if completed_ordinal is None:
+            counts['undated'] += 1
+        else:
+            counts[date.fromordinal(completed_ordinal).strftime('%Y-%m')] += 1
+    return dict(counts)
+
+
+def migrate_archive(completed_dir: Path) -> dict:
+    """Move a flat archive into YYYY/MM shards and rebuild the manifest.
+
+    Also picks up files already in shard folders, so it doubles as a
+    manifest rebuild after manual edits. Returns counts of moved, indexed and
+    undated files.
+    """
+    previous = load_archive_manifest(completed_dir)
+    manifest = {}
+    stats = {'moved': 0, 'indexed': 0, 'undated': 0}
+
+    # Files already in a YYYY/MM shard keep their place (and their original task name)
+    for shard_file in sorted(completed_dir.glob('[0-9][0-9][0-9][0-9]/[0-9][0-9]/*.md')):
+        task = parse_task_file(shard_file)
+        task_name = previous.get(shard_file.stem, [None, shard_file.stem])[1]
+        manifest[shard_file.stem] = [
+            shard_file.relative_to(completed_dir).as_posix(), task_name, task.completed_ordinal,
+        ]
+        stats['indexed'] += 1
+
+    for task_file in sorted(completed_dir.glob('*.md')):
+        task = parse_task_file(task_file)
+        dest = archive_task_file(manifest, completed_dir, task_file, task.completed_ordinal)
+        if dest == task_file:
+            stats['undated'] += 1
+        else:
+            stats['moved'] += 1
+
+    save_archive_manifest(completed_dir, manifest)
+    return stats
+
+
 def format_date_heading(date: datetime) -> str:
     """Format date for section heading: 'DayOfWeek, Month Day'."""
     return date.strftime('%A, %B %-d')
@@ -132,21 +1043,238 @@ def format_date_short(date: datetime) -> str:
     return date.strftime('%B %-d')
 
 
-def generate_this_week_md(tasks: list[dict], today: datetime, output_path: Path) -> dict:
-    """Generate this-week.md file. Returns stats."""
-    _, saturday = get_week_bounds(today)
-    tomorrow = today + timedelta(days=1)
+def days_in_month(year: int, month: int) -> int:
+    if month == 12:
+        return 31
+    return (date(year, month + 1, 1) - date(year, month, 1)).days
 
-    tasks_by_day = defaultdict(list)
-    today_str = today.strftime('%Y-%m-%d')
-    saturday_str = saturday.strftime('%Y-%m-%d')
 
+def recurrence_step(recurrence) -> tuple[str, int] | None:
+    """(unit, step) for a recurrence value; None for unknown or non-string values, which are not projected."""
+    return RECURRENCE_STEPS.get(recurrence) if isinstance(recurrence, str) else None
+
+
+def recurrence_occurrences(task: Task, first: int, last: int) -> list[int]:
+    """Ordinals of a recurring task's projected instances between first and last (inclusive).
+
+    Instances are counted forward from the stored due date, which is the
+    real next instance and is never included. Weekly and biweekly tasks
+    repeat every 7 or 14 days from it. Monthly, quarterly and yearly tasks
+    land on recurrence_day (or the due date's day), moved back to the last
+    day of shorter months. Only instances inside the window are computed,
+    so the cost does not depend on how far away the window is.
+    """
+    step = recurrence_step(task.recurrence)
+    due = task.due_ordinal
+    if step is None or due is None or last <= due:
+        return []
+    unit, size = step
+    first = max(first, due + 1)
+
+    if unit == 'days':
+        k = max(1, -(-(first - due) // size))
+        return list(range(due + k * size, last + 1, size))
+
+    due_date = date.fromordinal(due)
+    day = task.recurrence_day
+    if not isinstance(day, int) or not 1 <= day <= 31:
+        day = due_date.day
+    start_month = due_date.year * 12 + due_date.month - 1
+    first_date = date.fromordinal(first)
+    last_date = date.fromordinal(last)
+    first_month = first_date.year * 12 + first_date.month - 1
+    last_month = last_date.year * 12 + last_date.month - 1
+
+    occurrences = []
+    month = start_month + max(1, -(-(first_month - start_month) // size)) * size
+    while month <= last_month:
+        year, month0 = divmod(month, 12)
+        ordinal = date(year, month0 + 1, min(day, days_in_month(year, month0 + 1))).toordinal()
+        if first <= ordinal <= last:
+            occurrences.append(ordinal)
+        month += size
+    return occurrences
+
+
+def project_recurring(buckets: dict, first: int, last: int) -> dict:
+    """Projected instances of open recurring tasks: {ordinal: tasks sorted by name}."""
+    projected = defaultdict(list)
+    for task in buckets['recurring']:
+        for ordinal in recurrence_occurrences(task, first, last):
+            projected[ordinal].append(task)
+    for day_tasks in projected.values():
+        day_tasks.sort(key=lambda t: t.name)
+    return dict(projected)
+
+
+def build_due_buckets(tasks: list[Task]) -> dict:
+    """Group open tasks by due date in a single pass.
+
+    Returns {'days': sorted due ordinals, 'tasks': {due ordinal: tasks sorted
+    by name}, 'recurring': open recurring tasks}, shared by every view so
+    the task list is walked and sorted only once. 'days' is a compact
+    array('i') searched with bisect, so a date-range lookup costs
+    O(log n + k) however large the vault is.
+    """
+    by_due = defaultdict(list)
+    recurring = []
     for task in tasks:
-        if not task['due'] or task['completed']:
-            continue
+        if task.due_ordinal is not None and task.completed_ordinal is None:
+            by_due[task.due_ordinal].append(task)
+            if recurrence_step(task.recurrence):
+                recurring.append(task)
+
+    for day_tasks in by_due.values():
+        day_tasks.sort(key=lambda t: t.name)
+
+    return {'days': array('i', sorted(by_due)), 'tasks': dict(by_due), 'recurring': recurring}
+
+
+def add_to_buckets(buckets: dict, task: Task) -> int | None:
+    """Insert an open task into the buckets in name order. Returns its due ordinal."""
+    day = task.due_ordinal
+    if day is None or task.completed_ordinal is not None:
+        return None
 
-        if task['due'] > today_str and task['due'] <= saturday_str:
-            tasks_by_day[task['due']].append(task)
+    day_tasks = buckets['tasks'].get(day)
+    if day_tasks is None:
+        day_tasks = buckets['tasks'][day] = []
+        insort(buckets['days'], day)
+    names = [t.name for t in day_tasks]
+    day_tasks.insert(bisect_right(names, task.name), task)
+    if recurrence_step(task.recurrence):
+        buckets['recurring'].append(task)
+    return day
+
+
+def remove_from_buckets(buckets: dict, task: Task) -> int | None:
+    """Remove a task from the buckets. Returns the due ordinal it was under."""
+    day = task.due_ordinal
+    day_tasks = buckets['tasks'].get(day)
+    if not day_tasks or task not in day_tasks:
+        return None
+
+    day_tasks.remove(task)
+    if task in buckets['recurring']:
+        buckets['recurring'].remove(task)
+    if not day_tasks:
+        del buckets['tasks'][day]
+        buckets['days'].pop(bisect_left(buckets['days'], day))
+    return day
+
+
+def get_view_windows(today: datetime) -> dict:
+    """Inclusive (first, last) due ordinals each view shows; None is unbounded."""
+    _, saturday = get_week_bounds(today)
+    today_ord = today.toordinal()
+    saturday_ord = saturday.toordinal()
+    return {
+        'today': (None, today_ord),
+        'this_week': (today_ord + 1, saturday_ord),
+        'next_week': (saturday_ord + 1, saturday_ord + 7),
+    }
+
+
+def views_for_days(today: datetime, days) -> list[str]:
+    """Names of the views whose window contains any of the given due ordinals."""
+    affected = []
+    for name, (first, last) in get_view_windows(today).items():
+        if any(day is not None and (first is None or day >= first) and day <= last for day in days):
+            affected.append(name)
+    return affected
+
+
+def days_in_range(buckets: dict, start: date, end: date) -> list[int]:
+    """Due ordinals with open tasks between start and end (inclusive)."""
+    days = buckets['days']
+    return list(days[bisect_left(days, start.toordinal()):bisect_right(days, end.toordinal())])
+
+
+def tasks_in_range(buckets: dict, start: date, end: date) -> list[Task]:
+    """Open tasks due between start and end (inclusive), by due date then name."""
+    return [task for day in days_in_range(buckets, start, end) for task in buckets['tasks'][day]]
+
+
+def render_day_sections(buckets: dict, days: list[int], projected: dict | None = None,
+                        level: int = 2) -> tuple[list[str], int]:
+    """Render '## DayOfWeek, Month Day' sections for the given due ordinals.
+
+    Projected recurring instances (see project_recurring) get their own
+    days too, listed after the real tasks of the day and marked
+    '(projected)'. The returned count is of real tasks only. level is
+    the number of '#' in each day heading.
+    """
+    projected = projected or {}
+    if projected:
+        days = sorted(set(days) | projected.keys())
+
+    lines = []
+    total = 0
+    for day in days:
+        day_tasks = buckets['tasks'].get(day, [])
+        lines.append(f"{'#' * level} {format_date_heading(date.fromordinal(day))}")
+        for task in day_tasks:
+            lines.append(f"- [ ] [[{task.name}]]")
+        for task in projected.get(day, []):
+            lines.append(f"- [ ] [[{task.name}]] (projected)")
+        lines.append('')
+        total += len(day_tasks)
+    return lines, total
+
+
+def render_range_sections(buckets: dict, start: date, end: date, level: int = 2) -> tuple[list[str], dict]:
+    """Day sections for start..end with recurring tasks projected in. Returns (lines, stats)."""
+    projected = project_recurring(buckets, start.toordinal(), end.toordinal())
+    sections, total = render_day_sections(buckets, days_in_range(buckets, start, end), projected, level)
+    return sections, {'total': total, 'projected': sum(len(day_tasks) for day_tasks in projected.values())}
+
+
+def render_today_sections(buckets: dict, today: datetime) -> tuple[list[str], dict]:
+    """'## Overdue' and '## Due Today' sections. Returns (lines, stats)."""
+    overdue_days = buckets['days'][:bisect_left(buckets['days'], today.toordinal())]
+    due_today = buckets['tasks'].get(today.toordinal(), [])
+
+    lines = []
+    overdue = 0
+    if overdue_days:
+        lines.append('## Overdue')
+        for day in overdue_days:
+            due_str = ordinal_to_str(day)
+            for task in buckets['tasks'][day]:
+                lines.append(f"- [ ] [[{task.name}]] (due: {due_str})")
+                overdue += 1
+        lines.append('')
+
+    if due_today:
+        lines.append('## Due Today')
+        for task in due_today:
+            lines.append(f"- [ ] [[{task.name}]]")
+        lines.append('')
+
+    return lines, {'overdue': overdue, 'due_today': len(due_today)}
+
+
+def render_today(buckets: dict, today: datetime) -> tuple[str, dict]:
+    """Render today.md content. Returns (content, stats)."""
+    lines = [
+        '---',
+        f"date: {today.strftime('%Y-%m-%d')}",
+        '---',
+        f"# Today — {format_date_heading(today)}",
+        '',
+    ]
+
+    sections, stats = render_today_sections(buckets, today)
+    lines.extend(sections)
+
+    return '\n'.join(lines), stats
+
+
+def render_this_week(buckets: dict, today: datetime) -> tuple[str, dict]:
+    """Render this-week.md content (tomorrow through Saturday). Returns (content, stats)."""
+    _, saturday = get_week_bounds(today)
+    tomorrow = today + timedelta(days=1)
+    saturday_str = saturday.strftime('%Y-%m-%d')
 
     lines = [
         '---',
@@ -157,42 +1285,20 @@ def generate_this_week_md(tasks: list[dict], today: datetime, output_path: Path)
         '',
     ]
 
-    total_tasks = 0
-    current = tomorrow
-    while current <= saturday:
-        date_str = current.strftime('%Y-%m-%d')
-        if date_str in tasks_by_day:
-            day_tasks = sorted(tasks_by_day[date_str], key=lambda t: t['name'])
-            lines.append(f"## {format_date_heading(current)}")
-            for task in day_tasks:
-                lines.append(f"- [ ] [[{task['name']}]]")
-            lines.append('')
-            total_tasks += len(day_tasks)
-        current += timedelta(days=1)
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text('\n'.join(lines))
+    sections, stats = render_range_sections(buckets, tomorrow, saturday)
+    lines.extend(sections)
 
-    return {'total': total_tasks}
+    return '\n'.join(lines), stats
 
 
-def generate_next_week_md(tasks: list[dict], today: datetime, output_path: Path) -> dict:
-    """Generate next-week.md file. Returns stats."""
+def render_next_week(buckets: dict, today: datetime) -> tuple[str, dict]:
+    """Render next-week.md content (next Sunday through Saturday). Returns (content, stats)."""
     _, this_saturday = get_week_bounds(today)
     next_sunday = this_saturday + timedelta(days=1)
     next_saturday = next_sunday + timedelta(days=6)
-
-    tasks_by_day = defaultdict(list)
     next_sunday_str = next_sunday.strftime('%Y-%m-%d')
     next_saturday_str = next_saturday.strftime('%Y-%m-%d')
 
-    for task in tasks:
-        if not task['due'] or task['completed']:
-            continue
-
-        if task['due'] >= next_sunday_str and task['due'] <= next_saturday_str:
-            tasks_by_day[task['due']].append(task)
-
     lines = [
         '---',
         f"week_start: {next_sunday_str}",
@@ -202,20 +1308,352 @@ def generate_next_week_md(tasks: list[dict], today: datetime, output_path: Path)
         '',
     ]
 
-    total_tasks = 0
-    current = next_sunday
-    while current <= next_saturday:
-        date_str = current.strftime('%Y-%m-%d')
-        if date_str in tasks_by_day:
-            day_tasks = sorted(tasks_by_day[date_str], key=lambda t: t['name'])
-            lines.append(f"## {format_date_heading(current)}")
-            for task in day_tasks:
-                lines.append(f"- [ ] [[{task['name']}]]")
-            lines.append('')
-            total_tasks += len(day_tasks)
-        current += timedelta(days=1)
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text('\n'.join(lines))
-
-    return {'total': total_tasks}
+    sections, stats = render_range_sections(buckets, next_sunday, next_saturday)
+    lines.extend(sections)
+
+    return '\n'.join(lines), stats
+
+
+def render_range(buckets: dict, start: date, end: date, title: str | None = None) -> tuple[str, dict]:
+    """Render a planning page for any date range (inclusive). Returns (content, stats)."""
+    if title is None:
+        title = f"Tasks — {start.strftime('%B %-d, %Y')} to {end.strftime('%B %-d, %Y')}"
+
+    lines = [
+        '---',
+        f"range_start: {start.strftime('%Y-%m-%d')}",
+        f"range_end: {end.strftime('%Y-%m-%d')}",
+        '---',
+        f"# {title}",
+        '',
+    ]
+
+    sections, stats = render_range_sections(buckets, start, end)
+    lines.extend(sections)
+
+    return '\n'.join(lines), stats
+
+
+# View name -> renderer. Output paths come from get_paths() as f"{name}_file".
+VIEWS = {
+    'today': render_today,
+    'this_week': render_this_week,
+    'next_week': render_next_week,
+}
+
+
+def write_view(content: str, output_path: Path) -> bool:
+    """Write a rendered view, skipping the write if it is unchanged."""
+    return write_file(output_path, content)
+
+
+def render_views(buckets: dict, today: datetime, views=None) -> dict:
+    """Render several views from one shared bucket map. Returns {view name: (content, stats)}."""
+    return {name: VIEWS[name](buckets, today) for name in views or VIEWS}
+
+
+def generate_views(tasks: list[Task], today: datetime, paths: dict, views=None, buckets: dict | None = None) -> dict:
+    """Render and write several views from one shared bucket map. Returns stats per view name."""
+    if buckets is None:
+        buckets = build_due_buckets(tasks)
+
+    stats = {}
+    for name, (content, stats[name]) in render_views(buckets, today, views).items():
+        write_view(content, paths[f"{name}_file"])
+    return stats
+
+
+def generate_today_md(tasks: list[Task], today: datetime, output_path: Path) -> dict:
+    """Generate today.md file. Returns stats."""
+    content, stats = render_today(build_due_buckets(tasks), today)
+    write_view(content, output_path)
+    return stats
+
+
+def generate_this_week_md(tasks: list[Task], today: datetime, output_path: Path) -> dict:
+    """Generate this-week.md file. Returns stats."""
+    content, stats = render_this_week(build_due_buckets(tasks), today)
+    write_view(content, output_path)
+    return stats
+
+
+def generate_next_week_md(tasks: list[Task], today: datetime, output_path: Path) -> dict:
+    """Generate next-week.md file. Returns stats."""
+    content, stats = render_next_week(build_due_buckets(tasks), today)
+    write_view(content, output_path)
+    return stats
+
+
+def task_tags(task: Task) -> list[str]:
+    """A task's tags as clean strings: '#' prefixes and empty entries dropped.
+
+    Accepts a YAML list or a single comma/space separated string.
+    """
+    tags = task.tags
+    if not tags:
+        return []
+    if isinstance(tags, str):
+        tags = tags.replace(',', ' ').split()
+    elif not isinstance(tags, list):
+        tags = [tags]
+    cleaned = []
+    for tag in tags:
+        tag = str(tag).strip().lstrip('#').strip('/')
+        if tag and tag not in cleaned:
+            cleaned.append(tag)
+    return cleaned
+
+
+def build_tag_index(tasks: list[Task]) -> dict:
+    """Inverted index {tag: tasks} built in one pass over scanned tasks.
+
+    Nested tags count for every ancestor too, so a task tagged
+    project/alpha is listed under both 'project/alpha' and 'project'.
+    """
+    index = defaultdict(list)
+    for task in tasks:
+        for tag in expand_tags(task_tags(task)):
+            index[tag].append(task)
+    return dict(index)
+
+
+def expand_tags(tags: list[str]) -> list[str]:
+    """Tags plus every ancestor of nested ones, without duplicates (a/b -> a, a/b)."""
+    expanded = []
+    for tag in tags:
+        parts = tag.split('/')
+        for depth in range(1, len(parts) + 1):
+            name = '/'.join(parts[:depth])
+            if name not in expanded:
+                expanded.append(name)
+    return expanded
+
+
+def tag_buckets(tag_index: dict, tag: str) -> dict:
+    """Due buckets (see build_due_buckets) for the tasks carrying a tag."""
+    return build_due_buckets(tag_index.get(tag.strip().lstrip('#').strip('/'), []))
+
+
+def render_tag_page(buckets: dict, tag: str, today: datetime) -> tuple[str, dict]:
+    """Render a tag's page: overdue, due today, this week and next week. Returns (content, stats)."""
+    lines = [
+        '---',
+        f"tag: {tag}",
+        f"date: {today.strftime('%Y-%m-%d')}",
+        '---',
+        f"# #{tag}",
+        '',
+    ]
+
+    sections, stats = render_today_sections(buckets, today)
+    lines.extend(sections)
+
+    windows = get_view_windows(today)
+    for name, heading in (('this_week', 'This Week'), ('next_week', 'Next Week')):
+        first, last = windows[name]
+        # Day headings are subsections of the week
+        sections, view_stats = render_range_sections(buckets, date.fromordinal(first), date.fromordinal(last), 3)
+        stats[name] = view_stats['total']
+        if sections:
+            lines.append(f"## {heading}")
+            lines.extend(sections)
+
+    return '\n'.join(lines), stats
+
+
+def tag_page_path(tags_dir: Path, tag: str) -> Path:
+    """Page for a tag; nested tags get nested folders (project/alpha -> project/alpha.md)."""
+    parts = [part for part in tag.split('/') if part not in ('', '.', '..')]
+    return tags_dir.joinpath(*parts[:-1]) / f"{parts[-1]}.md"
+
+
+def generate_tag_views(tag_index: dict, today: datetime, tags_dir: Path, tags=None) -> dict:
+    """Write a page per tag from one shared tag index.
+
+    With tags=None every tag gets a page, and pages left over from tags
+    no task uses any more are removed. Returns {'written', 'unchanged',
+    'removed'} counts.
+    """
+    stats = {'written': 0, 'unchanged': 0, 'removed': 0}
+    for tag in sorted(tag_index if tags is None else tags):
+        content, _ = render_tag_page(tag_buckets(tag_index, tag), tag, today)
+        if write_view(content, tag_page_path(tags_dir, tag)):
+            stats['written'] += 1
+        else:
+            stats['unchanged'] += 1
+
+    if tags is None and tags_dir.exists():
+        current = {tag_page_path(tags_dir, tag) for tag in tag_index}
+        for page in tags_dir.rglob('*.md'):
+            # Only remove pages this function wrote (they carry a tag: key)
+            if page not in current and 'tag' in read_frontmatter(page):
+                page.unlink()
+                stats['removed'] += 1
+    return stats
+
+
+def extract_task_list(generated_file: Path) -> str:
+    """Extract the task list content (without frontmatter/title) from a generated file."""
+    if not generated_file.exists():
+        return ''
+    return task_list_of(read_text(generated_file))
+
+
+def task_list_of(content: str) -> str:
+    """The task list of rendered view content, without frontmatter and title."""
+    _, body = parse_frontmatter(content)
+
+    # Remove the main title line
+    lines = body.split('\n')
+    result_lines = []
+    skip_title = True
+
+    for line in lines:
+        if skip_title and line.startswith('# '):
+            skip_title = False
+            continue
+        result_lines.append(line)
+
+    return '\n'.join(result_lines).strip()
+
+
+def read_note(note_file: Path, template_file: Path, date_str: str, default: str,
+              templates: dict | None = None) -> str:
+    """Read a note, or build its initial content from a template (or default) if missing.
+
+    Pass the same templates dict across calls to read each template only once.
+    """
+    if note_file.exists():
+        return read_text(note_file)
+
+    if templates is not None and template_file in templates:
+        template = templates[template_file]
+    else:
+        template = read_text(template_file) if template_file.exists() else None
+        if templates is not None:
+            templates[template_file] = template
+
+    if template is not None:
+        # Replace template date placeholder if present
+        return template.replace('{{date}}', date_str)
+    return default
+
+
+def update_task_block(content: str, task_content: str) -> str:
+    """Put a task list in the note's managed block, replacing what the block held.
+
+    The block is delimited by TASK_BLOCK_START/TASK_BLOCK_END (HTML comments,
+    invisible in Obsidian). Everything outside it is kept byte-for-byte, so
+    re-running with the same list returns the content unchanged. A note
+    without a block gets one right under its ## Tasks heading (a heading is
+    appended if missing); an empty list adds no block but empties an
+    existing one. Unmarked text is never removed, except a copy of this very
+    list that an older version inserted under ## Tasks without markers.
+    """
+    start = content.find(TASK_BLOCK_START)
+    end = content.find(TASK_BLOCK_END, start) if start != -1 else -1
+    if end != -1:
+        inner = f"\n{task_content}\n" if task_content else '\n'
+        return content[:start + len(TASK_BLOCK_START)] + inner + content[end:]
+
+    if not task_content:
+        return content
+
+    block = f"{TASK_BLOCK_START}\n{task_content}\n{TASK_BLOCK_END}"
+    if '## Tasks' in content:
+        # Find the end of the ## Tasks line
+        tasks_idx = content.find('## Tasks')
+        newline_idx = content.find('\n', tasks_idx)
+        if newline_idx == -1:
+            return content + '\n\n' + block + '\n'
+        rest = newline_idx + 1
+        legacy = f"\n{task_content}\n"
+        if content.startswith(legacy, rest):
+            # Older versions inserted exactly this, unmarked; take it over
+            rest += len(legacy)
+        return content[:newline_idx + 1] + '\n' + block + '\n' + content[rest:]
+
+    return content.rstrip() + '\n\n## Tasks\n\n' + block + '\n'
+
+
+def sync_to_daily_note(paths: dict, today: datetime) -> Path:
+    """Sync today's tasks to daily note."""
+    date_str = today.strftime('%Y-%m-%d')
+    daily_file = paths['daily'] / f"{date_str}.md"
+
+    content = read_note(daily_file, paths['templates'] / 'Daily.md', date_str,
+                        f"# {date_str}\n\n## Tasks\n\n")
+    content = update_task_block(content, extract_task_list(paths['today_file']))
+    write_file(daily_file, content)
+
+    return daily_file
+
+
+def sync_to_weekly_note(paths: dict, today: datetime) -> Path:
+    """Sync this week's tasks to weekly note."""
+    sunday, _ = get_week_bounds(today)
+    date_str = sunday.strftime('%Y-%m-%d')
+    weekly_file = paths['weekly'] / f"{date_str}.md"
+
+    content = read_note(weekly_file, paths['templates'] / 'Weekly.md', date_str,
+                        f"# Week of {date_str}\n\n## Tasks\n\n")
+    content = update_task_block(content, extract_task_list(paths['this_week_file']))
+    write_file(weekly_file, content)
+
+    return weekly_file
+
+
+def fill_missing_note(note_file: Path, template_file: Path, date_str: str, default: str,
+                      task_content: str, templates: dict) -> bool:
+    """Create a note, or add the task block to one without a task list. Returns True if written.
+
+    Notes that already have a managed block, or list items or view headings
+    right under ## Tasks (such as an unmarked list from an older version),
+    were synced on their own day and are left alone.
+    """
+    content = read_note(note_file, template_file, date_str, default, templates)
+    if TASK_BLOCK_START in content:
+        return False
+    heading = content.find('## Tasks')
+    if heading != -1:
+        section = content[content.find('\n', heading) + 1 or len(content):].lstrip('\r\n')
+        if section.startswith('- ') or VIEW_HEADING.fullmatch(section.split('\n', 1)[0]):
+            return False
+    return write_file(note_file, update_task_block(content, task_content))
+
+
+def backfill_notes(tasks: list[Task], paths: dict, first: datetime, last: datetime,
+                   buckets: dict | None = None) -> dict:
+    """Fill in daily and weekly notes for every day from first to last (inclusive).
+
+    Each daily note gets the today view as of its own date, and each weekly
+    note the this-week view as of the first backfilled day of that week.
+    All days share one set of due buckets and one read of each template, so
+    the cost grows with the number of days rather than days x vault size.
+    Returns the notes written: {'daily': [paths], 'weekly': [paths]}.
+    """
+    if buckets is None:
+        buckets = build_due_buckets(tasks)
+
+    templates = {}
+    written = {'daily': [], 'weekly': []}
+    day = first
+    while day <= last:
+        date_str = day.strftime('%Y-%m-%d')
+        daily_file = paths['daily'] / f"{date_str}.md"
+        content, _ = render_today(buckets, day)
+        if fill_missing_note(daily_file, paths['templates'] / 'Daily.md', date_str,
+                             f"# {date_str}\n\n## Tasks\n\n", task_list_of(content), templates):
+            written['daily'].append(daily_file)
+
+        sunday, _ = get_week_bounds(day)
+        if day == first or day == sunday:
+            sunday_str = sunday.strftime('%Y-%m-%d')
+            weekly_file = paths['weekly'] / f"{sunday_str}.md"
+            content, _ = render_this_week(buckets, day)
+            if fill_missing_note(weekly_file, paths['templates'] / 'Weekly.md', sunday_str,
+                                 f"# Week of {sunday_str}\n\n## Tasks\n\n", task_list_of(content), templates):
+                written['weekly'].append(weekly_file)
+
+        day += timedelta(days=1)
+    return written
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Watch the tasks folder and regenerate views incrementally on change."""
+
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+from task_utils import (
+    add_to_buckets, build_due_buckets, generate_views, get_view_windows, parse_task_file,
+    recurrence_occurrences, remove_from_buckets, views_for_days,
+)
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:  # optional dependency; fall back to stat polling
+    INotify = None
+
+
+class InotifyWatcher:
+    """Report changed task filenames using inotify."""
+
+    def __init__(self, tasks_dir: Path):
+        self.inotify = INotify()
+        mask = flags.CLOSE_WRITE | flags.CREATE | flags.DELETE | flags.MOVED_FROM | flags.MOVED_TO
+        self.inotify.add_watch(str(tasks_dir), mask)
+
+    def poll(self, timeout: float) -> set[str]:
+        events = self.inotify.read(timeout=int(timeout * 1000))
+        return {event.name for event in events if event.name.endswith('.md')}
+
+
+class PollingWatcher:
+    """Report changed task filenames by comparing stat snapshots."""
+
+    def __init__(self, tasks_dir: Path, interval: float = 1.0):
+        self.tasks_dir = tasks_dir
+        self.interval = interval
+        self.snapshot = self.take_snapshot()
+
+    def take_snapshot(self) -> dict:
+        snapshot = {}
+        with os.scandir(self.tasks_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.md') and entry.is_file():
+                    st = entry.stat()
+                    snapshot[entry.name] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        return snapshot
+
+    def poll(self, timeout: float) -> set[str]:
+        time.sleep(min(timeout, self.interval))
+        snapshot = self.take_snapshot()
+        changed = {name for name in snapshot.keys() | self.snapshot.keys()
+                   if snapshot.get(name) != self.snapshot.get(name)}
+        self.snapshot = snapshot
+        return changed
+
+
+def get_watcher(tasks_dir: Path, poll_interval: float = 1.0):
+    """Use inotify when the binding is installed and supported, else stat polling."""
+    if INotify is not None:
+        try:
+            return InotifyWatcher(tasks_dir)
+        except OSError:
+            pass
+    return PollingWatcher(tasks_dir, poll_interval)
+
+
+def current_day() -> datetime:
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def apply_changes(tasks_by_name: dict, buckets: dict, tasks_dir: Path, names: set[str],
+                  window: tuple[int, int] | None = None) -> set:
+    """Re-read changed files into the in-memory tasks. Returns due ordinals touched.
+
+    With a (first, last) window, the projected instances of changed
+    recurring tasks inside it count as touched too.
+    """
+    touched = set()
+    for filename in names:
+        name = filename[:-len('.md')]
+        old = tasks_by_name.pop(name, None)
+        if old is not None:
+            touched.add(remove_from_buckets(buckets, old))
+            if window:
+                touched.update(recurrence_occurrences(old, *window))
+
+        task_file = tasks_dir / filename
+        if not task_file.is_file():
+            continue
+        try:
+            task = parse_task_file(task_file)
+        except OSError:
+            # Deleted or renamed between the event and the read
+            continue
+        tasks_by_name[name] = task
+        touched.add(add_to_buckets(buckets, task))
+        if window:
+            touched.update(recurrence_occurrences(task, *window))
+
+    touched.discard(None)
+    return touched
+
+
+def watch(tasks: list, paths: dict, debounce: float = 0.5, poll_interval: float = 1.0):
+    """Keep views up to date until interrupted.
+
+    Changes are collected until the folder has been quiet for `debounce`
+    seconds, so a burst of edits from a sync client triggers one refresh.
+    Only views whose date window holds an old or new due date of a changed
+    task are re-rendered; all views are re-rendered when the day rolls over.
+    """
+    tasks_dir = paths['tasks']
+    tasks_by_name = {task.name: task for task in tasks}
+    buckets = build_due_buckets(tasks)
+    watcher = get_watcher(tasks_dir, poll_interval)
+    today = current_day()
+
+    print(f"Watching {tasks_dir} ({type(watcher).__name__}). Press Ctrl-C to stop.")
+
+    pending = set()
+    while True:
+        changed = watcher.poll(debounce)
+        if changed:
+            pending |= changed
+            continue
+
+        now = current_day()
+        if now != today:
+            today = now
+            generate_views(None, today, paths, buckets=buckets)
+            print(f"Day changed to {today.strftime('%Y-%m-%d')}: regenerated all views")
+
+        if pending:
+            windows = get_view_windows(today)
+            window = (today.toordinal() + 1, max(last for _, last in windows.values()))
+            touched = apply_changes(tasks_by_name, buckets, tasks_dir, pending, window)
+            views = views_for_days(today, touched)
+            if views:
+                generate_views(None, today, paths, views, buckets)
+            print(f"{len(pending)} file(s) changed: regenerated {', '.join(views) or 'nothing'}")
+            pending = set()
@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+"""Run task management commands in one process, sharing a single scan.
+
+Usage: tasks.py COMMAND [COMMAND ...]
+
+Commands run in the order given, e.g. `tasks.py archive today`.
+`tasks.py range` renders any date range (next 30 days by default; see
+--from, --to, --days and --month). `tasks.py backfill --backfill FROM..TO`
+fills in daily and weekly notes missed in that range. --as-of DATE runs
+any command as if today were DATE. `tasks.py tags` writes a page per tag,
+and --tag limits it (or range) to the given tags. `tasks.py stats` writes
+completion stats, for completions in --from/--to if given.
+
+With several vaults under `vaults:` in config.yaml, the commands run for
+every vault (or each --vault NAME) in parallel worker processes, followed
+by a combined summary.
+"""
+
+import argparse
+import io
+import os
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from task_utils import (
+    WRITE_STATS, load_config, get_paths, get_scan_workers, scan_tasks, build_due_buckets,
+    normalize_task_dates, archive_completed_tasks, generate_views, sync_to_daily_note,
+    sync_to_weekly_note, normalize_date, days_in_month, render_range, write_file, backfill_notes,
+    build_tag_index, generate_tag_views, vault_configs, IO_STATS, count_io,
+)
+from task_profile import PHASE_TIMES, add_profile_args, phase, run_profiled
+
+
+class Session:
+    """Config, paths and one scan of the tasks folder, shared by every command in a run."""
+
+    def __init__(self, today: datetime | None = None, options=None, vault: str | None = None):
+        with phase('config'):
+            vaults = vault_configs(load_config())
+            self.vault = vault or (getattr(options, 'vault', None) or list(vaults))[0]
+            if self.vault not in vaults:
+                raise ValueError(f"No vault named {self.vault!r} in config (vaults: {', '.join(vaults)})")
+            self.config = vaults[self.vault]
+            self.paths = get_paths(self.config)
+            if not self.paths['vault_root'].is_dir():
+                # Don't build a fresh notes tree under a mistyped vault_root
+                raise FileNotFoundError(f"Vault root does not exist: {self.paths['vault_root']}")
+        self.scan_workers = get_scan_workers(self.config)
+        self.today = today or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.options = options
+        self.view_stats = {}
+        self._tasks = None
+        self._buckets = None
+        self._tag_index = None
+
+    @property
+    def tasks(self) -> list:
+        if self._tasks is None:
+            with phase('scan'):
+                if self.config.get('mirror', {}).get('enabled', False):
+                    from task_mirror import mirror_tasks
+
+                    self._tasks = mirror_tasks(self.paths)
+                else:
+                    self._tasks = scan_tasks(self.paths['tasks'], self.paths['index'], self.scan_workers)
+        return self._tasks
+
+    @property
+    def buckets(self) -> dict:
+        if self._buckets is None:
+            self._buckets = build_due_buckets(self.tasks)
+        return self._buckets
+
+    @property
+    def tag_index(self) -> dict:
+        if self._tag_index is None:
+            tasks = self.tasks
+            with phase('tags'):
+                self._tag_index = build_tag_index(tasks)
+        return self._tag_index
+
+    def drop(self, names: list[str]):
+        """Forget tasks that were moved out of the tasks folder (e.g. archived)."""
+        if names:
+            dropped = set(names)
+            self._tasks = [task for task in self.tasks if task.name not in dropped]
+            self._buckets = None
+            self._tag_index = None
+
+    def generate(self, views=None) -> dict:
+        tasks = self.tasks
+        with phase('render'):
+            stats = generate_views(tasks, self.today, self.paths, views, self.buckets)
+        self.view_stats.update(stats)
+        return stats
+
+
+def format_projected(stats: dict) -> str:
+    return f" (+{stats['projected']} projected)" if stats.get('projected') else ''
+
+
+def today_steps(session: Session) -> dict:
+    """Normalize, archive, generate all views and sync daily/weekly notes, one step at a time."""
+    paths = session.paths
+
+    tasks = session.tasks
+
+    # Normalize dates
+    with phase('normalize'):
+        normalized = normalize_task_dates(tasks)
+
+    # Archive completed tasks
+    with phase('archive'):
+        archived = archive_completed_tasks(tasks, paths['completed'])
+    session.drop(archived)
+
+    # Generate files from one shared pass over the tasks
+    views = session.generate()
+
+    # Sync to daily/weekly notes
+    with phase('sync'):
+        daily_note = sync_to_daily_note(paths, session.today)
+        weekly_note = sync_to_weekly_note(paths, session.today)
+
+    return {'normalized': normalized, 'archived': archived, 'views': views,
+            'daily_note': daily_note, 'weekly_note': weekly_note}
+
+
+def get_pipeline_concurrency(session: Session) -> int:
+    """Concurrency for the asyncio pipeline: --pipeline, else pipeline.concurrency (0 runs serially)."""
+    concurrency = getattr(session.options, 'pipeline', None)
+    if concurrency is None:
+        concurrency = session.config.get('pipeline', {}).get('concurrency', 0)
+    return int(concurrency or 0)
+
+
+def cmd_today(session: Session) -> int:
+    """Normalize, archive, generate all views and sync daily/weekly notes."""
+    concurrency = get_pipeline_concurrency(session)
+    if concurrency > 0:
+        from task_pipeline import run_today_pipeline
+
+        result = run_today_pipeline(session, concurrency)
+    else:
+        result = today_steps(session)
+
+    paths = session.paths
+    if result['normalized']:
+        print(f"Normalized dates in {result['normalized']} file(s)")
+    if result['archived']:
+        print(f"Archived {len(result['archived'])} completed task(s)")
+
+    today_stats = result['views']['today']
+    this_week_stats = result['views']['this_week']
+    next_week_stats = result['views']['next_week']
+
+    print()
+    print("Generated task files:")
+    print(f"- today.md: {today_stats['overdue']} overdue, {today_stats['due_today']} due today")
+    print(f"- this-week.md: {this_week_stats['total']} tasks{format_projected(this_week_stats)}")
+    print(f"- next-week.md: {next_week_stats['total']} tasks{format_projected(next_week_stats)}")
+
+    print()
+    print(f"Synced to daily note: {result['daily_note'].relative_to(paths['vault_root'])}")
+    print(f"Synced to weekly note: {result['weekly_note'].relative_to(paths['vault_root'])}")
+    if WRITE_STATS['skipped']:
+        print(f"Skipped {WRITE_STATS['skipped']} unchanged file(s)")
+    return 0
+
+
+def cmd_this_week(session: Session) -> int:
+    """Regenerate this-week.md."""
+    stats = session.generate(['this_week'])
+    print(f"Generated this-week.md: {stats['this_week']['total']} tasks{format_projected(stats['this_week'])}")
+    return 0
+
+
+def cmd_next_week(session: Session) -> int:
+    """Regenerate next-week.md."""
+    stats = session.generate(['next_week'])
+    print(f"Generated next-week.md: {stats['next_week']['total']} tasks{format_projected(stats['next_week'])}")
+    return 0
+
+
+def cmd_archive(session: Session) -> int:
+    """Archive completed one-time tasks."""
+    if not session.paths['tasks'].exists():
+        print("No tasks folder found.")
+        return 0
+
+    tasks = session.tasks
+    with phase('archive'):
+        archived = archive_completed_tasks(tasks, session.paths['completed'])
+    session.drop(archived)
+
+    if archived:
+        print(f"Archived {len(archived)} task(s) to completed/:")
+        for name in archived:
+            print(f"- [[{name}]]")
+    else:
+        print("No completed tasks to archive.")
+    return 0
+
+
+def get_range(options, today: datetime) -> tuple[date, date, str | None]:
+    """Resolve range options to (start, end, title); the default is the next 30 days."""
+    if options.month:
+        year, month = options.month
+        return (date(year, month, 1), date(year, month, days_in_month(year, month)),
+                date(year, month, 1).strftime('%B %Y'))
+    start = options.start or today.date()
+    end = options.end or start + timedelta(days=options.days - 1)
+    return start, end, None
+
+
+def cmd_range(session: Session) -> int:
+    """Render tasks due in a date range to stdout or --output."""
+    start, end, title = get_range(session.options, session.today)
+    if end < start:
+        print(f"Range ends before it starts: {start} to {end}", file=sys.stderr)
+        return 1
+
+    tags = session.options.tag
+    if tags:
+        tag_index = session.tag_index
+        with phase('render'):
+            tasks = {task.name: task for tag in tags for task in tag_index.get(tag.strip('#/'), [])}
+            content, stats = render_range(build_due_buckets(tasks.values()), start, end,
+                                          title or f"Tasks tagged {', '.join('#' + tag for tag in tags)}")
+    else:
+        tasks = session.tasks
+        with phase('render'):
+            content, stats = render_range(session.buckets, start, end, title)
+
+    output = session.options.output
+    if output is None:
+        print(content)
+        return 0
+
+    output_path = session.paths['vault_root'] / output
+    write_file(output_path, content)
+    print(f"Generated {output}: {stats['total']} tasks{format_projected(stats)}")
+    return 0
+
+
+def cmd_tags(session: Session) -> int:
+    """Write a page per tag (or per --tag) with its overdue, today, this-week and next-week tasks."""
+    tag_index = session.tag_index
+    tags = [tag.strip('#/') for tag in session.options.tag] if session.options and session.options.tag else None
+    tags_dir = session.paths['tags_dir']
+    with phase('render'):
+        stats = generate_tag_views(tag_index, session.today, tags_dir, tags)
+
+    print(f"Generated tag pages in {tags_dir.relative_to(session.paths['vault_root'])}/: "
+          f"{stats['written']} written, {stats['unchanged']} unchanged, {stats['removed']} removed")
+    return 0
+
+
+def cmd_backfill(session: Session) -> int:
+    """Create or fill in the daily and weekly notes for every day in --backfill."""
+    first, last = session.options.backfill
+    paths = session.paths
+    tasks = session.tasks
+    with phase('sync'):
+        written = backfill_notes(tasks, paths, first, last, session.buckets)
+
+    print(f"Backfilled {first.strftime('%Y-%m-%d')} to {last.strftime('%Y-%m-%d')}:")
+    print(f"- {len(written['daily'])} daily note(s), {len(written['weekly'])} weekly note(s)")
+    for note in written['daily'] + written['weekly']:
+        print(f"  - {note.relative_to(paths['vault_root'])}")
+    return 0
+
+
+def cmd_stats(session: Session) -> int:
+    """Write completion stats (throughput per week, lateness, recurring vs one-time) to the vault."""
+    from task_mirror import get_mirror_path
+    from task_stats import generate_stats_report
+
+    paths = session.paths
+    options = session.options
+    output = getattr(options, 'output', None)
+    output_path = paths['vault_root'] / output if output else paths['stats_file']
+    # The mirror already holds every archived header; use it once it exists
+    use_mirror = session.config.get('mirror', {}).get('enabled', False) or get_mirror_path(paths).exists()
+    tasks = session.tasks
+    with phase('stats'):
+        stats = generate_stats_report(tasks, paths, session.today.date(), output_path, use_mirror,
+                                      getattr(options, 'start', None), getattr(options, 'end', None))
+
+    total = stats['total']
+    print(f"Generated {output_path.relative_to(paths['vault_root'])}: "
+          f"{total['one_time'] + total['recurring']} completions "
+          f"({total['one_time']} one-time, {total['recurring']} recurring) in {len(stats['weeks'])} week(s)")
+    return 0
+
+
+def cmd_check(session: Session | None) -> int:
+    """Validate the vault structure (install-check.py)."""
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location('install_check', Path(__file__).parent / 'install-check.py')
+    install_check = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(install_check)
+    try:
+        with phase('check'):
+            install_check.main([])
+    except SystemExit as e:
+        return e.code or 0
+    return 0
+
+
+COMMANDS = {
+    'today': cmd_today,
+    'this-week': cmd_this_week,
+    'next-week': cmd_next_week,
+    'archive': cmd_archive,
+    'range': cmd_range,
+    'backfill': cmd_backfill,
+    'tags': cmd_tags,
+    'stats': cmd_stats,
+    'check': cmd_check,
+}
+
+
+def run(commands: list[str], session: Session | None = None, options=None) -> int:
+    """Run commands in order against one shared session. Returns the worst exit status."""
+    status = 0
+    for i, name in enumerate(commands):
+        if i:
+            print()
+        if name == 'check':
+            # Works without a valid config, so it must not force a Session
+            status = max(status, cmd_check(session))
+            continue
+        if session is None:
+            session = Session(getattr(options, 'as_of', None), options)
+        status = max(status, COMMANDS[name](session))
+    return status
+
+
+def selected_vaults(options=None) -> list[str]:
+    """Names of the vaults to run: --vault (repeatable), or every configured vault."""
+    vaults = vault_configs(load_config())
+    names = getattr(options, 'vault', None) or list(vaults)
+    unknown = [name for name in names if name not in vaults]
+    if unknown:
+        raise ValueError(f"No vault named {', '.join(map(repr, unknown))} in config (vaults: {', '.join(vaults)})")
+    return names
+
+
+def get_vault_workers(names: list[str]) -> int:
+    """Process count for a multi-vault run (scan.vault_workers; 0 means one per core)."""
+    config = vault_configs(load_config())[names[0]]
+    workers = int(config.get('scan', {}).get('vault_workers', 0) or 0)
+    return min(len(names), workers or os.cpu_count() or 1)
+
+
+def run_in_vault(vault: str, commands: list[str], today: datetime, options) -> dict:
+    """Run commands against one vault in a worker process, capturing its output.
+
+    Any error is caught and returned, so one broken vault never stops the
+    others. The worker's timings and I/O counts come back for merging.
+    """
+    # Pool processes are reused; start each vault's counters from zero
+    for stats in (IO_STATS, WRITE_STATS):
+        for key in stats:
+            stats[key] = 0
+    PHASE_TIMES.clear()
+
+    output, errors = io.StringIO(), io.StringIO()
+    result = {'vault': vault, 'status': 1, 'error': None, 'view_stats': {}}
+    try:
+        with redirect_stdout(output), redirect_stderr(errors):
+            session = Session(today, options, vault)
+            result['status'] = run(commands, session, options)
+            result['view_stats'] = session.view_stats
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result.update(output=output.getvalue(), errors=errors.getvalue(), phases=dict(PHASE_TIMES),
+                  io=dict(IO_STATS), skipped=WRITE_STATS['skipped'])
+    return result
+
+
+def format_vault_summary(result: dict) -> str:
+    if result['error']:
+        return f"- {result['vault']}: failed — {result['error']}"
+    stats = result['view_stats']
+    parts = []
+    if 'today' in stats:
+        parts.append(f"{stats['today']['overdue']} overdue, {stats['today']['due_today']} due today")
+    if 'this_week' in stats:
+        parts.append(f"{stats['this_week']['total']} this week")
+    if 'next_week' in stats:
+        parts.append(f"{stats['next_week']['total']} next week")
+    if not parts:
+        parts.append('ok' if result['status'] == 0 else 'failed')
+    return f"- {result['vault']}: {', '.join(parts)}"
+
+
+def run_vaults(names: list[str], commands: list[str], options=None) -> int:
+    """Run commands against several vaults in parallel processes, then print a combined summary."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    today = getattr(options, 'as_of', None) or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    results = []
+    with phase('vaults'), ProcessPoolExecutor(max_workers=get_vault_workers(names)) as pool:
+        futures = [(name, pool.submit(run_in_vault, name, commands, today, options)) for name in names]
+        for name, future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # The worker process died (or its result could not be sent back)
+                results.append({'vault': name, 'status': 1, 'error': f"{type(e).__name__}: {e}",
+                                'output': '', 'errors': ''})
+
+    for result in results:
+        print(f"=== {result['vault']} ===")
+        print(result['output'], end='')
+        if result['errors']:
+            print(result['errors'], end='', file=sys.stderr)
+        if result['error']:
+            print(f"Error: {result['error']}", file=sys.stderr)
+        print()
+        # Fold the worker's counters into this process's, for --timings
+        count_io(**result.get('io', {}))
+        WRITE_STATS['skipped'] += result.get('skipped', 0)
+        for name, seconds in result.get('phases', {}).items():
+            PHASE_TIMES[name] = PHASE_TIMES.get(name, 0.0) + seconds
+
+    failed = sum(1 for result in results if result['status'] or result['error'])
+    print(f"Vaults: {len(results) - failed} ok, {failed} failed")
+    for result in results:
+        print(format_vault_summary(result))
+    return 1 if failed else 0
+
+
+def date_arg(value: str) -> date:
+    normalized = normalize_date(value)
+    if normalized is None:
+        raise argparse.ArgumentTypeError(f"not a date: {value!r}")
+    return date.fromisoformat(normalized)
+
+
+def day_arg(value: str) -> datetime:
+    return datetime.combine(date_arg(value), datetime.min.time())
+
+
+def backfill_arg(value: str) -> tuple[datetime, datetime]:
+    first, sep, last = value.partition('..')
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected FROM..TO, got {value!r}")
+    first, last = day_arg(first), day_arg(last)
+    if last < first:
+        raise argparse.ArgumentTypeError(f"range ends before it starts: {value!r}")
+    return first, last
+
+
+def add_date_args(parser):
+    parser.add_argument('--as-of', type=day_arg, metavar='DATE', help='run as if today were DATE')
+    parser.add_argument('--backfill', type=backfill_arg, metavar='FROM..TO',
+                        help='create or fill in the daily and weekly notes for every day in the range')
+
+
+def month_arg(value: str) -> tuple[int, int]:
+    try:
+        month = datetime.strptime(value, '%Y-%m')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a YYYY-MM month: {value!r}")
+    return month.year, month.month
+
+
+def add_range_args(parser):
+    group = parser.add_argument_group('range options')
+    group.add_argument('--from', dest='start', type=date_arg, metavar='DATE', help='first day (default: today)')
+    group.add_argument('--to', dest='end', type=date_arg, metavar='DATE', help='last day (default: --days from --from)')
+    group.add_argument('--days', type=int, default=30, help='range length when --to is not given (default: 30)')
+    group.add_argument('--month', type=month_arg, metavar='YYYY-MM', help='a whole calendar month')
+    group.add_argument('--output', metavar='PATH', help='write to PATH (relative to the vault root) instead of stdout')
+    add_tag_args(parser)
+
+
+def add_pipeline_args(parser):
+    parser.add_argument('--pipeline', nargs='?', type=int, const=16, metavar='N',
+                        help='overlap file operations on a thread pool, N at a time (default: 16; 0 runs serially)')
+
+
+def add_vault_args(parser, several: bool = True):
+    if several:
+        parser.add_argument('--vault', action='append', metavar='NAME',
+                            help='run against this vault from the vaults: list (repeatable; default: all of them)')
+    else:
+        parser.add_argument('--vault', type=lambda name: [name], metavar='NAME',
+                            help='use this vault from the vaults: list (default: the first one)')
+
+
+def add_tag_args(parser):
+    parser.add_argument('--tag', action='append', metavar='TAG',
+                        help='only tasks with this tag or a tag nested under it (repeatable)')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('commands', nargs='+', choices=list(COMMANDS), metavar='COMMAND',
+                        help=f"one or more of: {', '.join(COMMANDS)}")
+    add_date_args(parser)
+    add_range_args(parser)
+    add_pipeline_args(parser)
+    add_vault_args(parser)
+    add_profile_args(parser)
+    args = parser.parse_args(argv)
+    if 'backfill' in args.commands and not args.backfill:
+        parser.error("the backfill command needs --backfill FROM..TO")
+    if args.month and (args.start or args.end):
+        parser.error("--month cannot be combined with --from/--to")
+    if args.days < 1:
+        parser.error("--days must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        names = selected_vaults(args)
+    except (OSError, ValueError) as e:
+        names = None
+        if args.commands != ['check']:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+    if names and len(names) > 1:
+        sys.exit(run_profiled(args, run_vaults, names, args.commands, args))
+    sys.exit(run_profiled(args, run, args.commands, None, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""The fast frontmatter parser must read headers exactly like yaml.safe_load."""
+
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from task_utils import load_frontmatter_yaml
+
+# Headers the fast frontmatter parser must read exactly like yaml.safe_load.
+# Covers the simple forms it handles itself and the tricky ones it must hand
+# back to YAML (booleans, octal-looking numbers, comments, nesting, tabs...).
+CORPUS = [
+    '',
+    '\n',
+    '\ndue: 2025-02-15\n',
+    '\ndue: 2025-02-15\ntags:\n  - project\n  - urgent\n',
+    '\ndue: 2025-02-15\ntags:\n- a\n- b\n',
+    '\ndue: 2025-02-15\ntags: [a, b, project/alpha]\n',
+    '\ntags: []\n',
+    '\ntags:\n',
+    '\ndue: 2025-02-15\nrecurrence: monthly\nrecurrence_day: 15\ntags:\n  - admin\n',
+    '\ndue: 2/15/2025\n',
+    '\ndue: 2025/02/15\n',
+    '\ndue: 2025-2-5\n',
+    "\ndue: '2025-02-15'\n",
+    '\ndue: "2025-02-15"\n',
+    '\ndue: 2025-02-30\n',
+    '\ndue: 2025-02-15 10:30:00\n',
+    '\ndue: 2025-02-15 # comment\n',
+    '\ncompleted: 2025-02-16\ndue: 2025-02-15\n',
+    '\nrecurrence_day: 007\n',
+    '\nrecurrence_day: 1_000\n',
+    '\nrecurrence_day: -0\n',
+    '\nrecurrence_day: 12:30\n',
+    '\nrecurrence_day: 1.5\n',
+    '\nrecurrence: yes\n',
+    '\nrecurrence: On\n',
+    '\nrecurrence: NULL\n',
+    '\nrecurrence: ~\n',
+    '\nrecurrence: y\n',
+    '\nyes: 1\n',
+    '\ntitle: a - b/c.d\n',
+    "\ntitle: 'it''s'\n",
+    '\ntitle: "a\\tb"\n',
+    '\ntitle: \t tabbed\n',
+    '\ntitle: café\n',
+    '\ntitle: |\n  block\n',
+    '\ntitle:\n  continued\n',
+    '\nmeta:\n  nested: 1\n',
+    '\ntags: [a, [b]]\n',
+    '\ntags: [a,]\n',
+    "\ntags: ['a,b']\n",
+    '\ntags:\n  - a\n - b\n',
+    '\nanchor: &a x\nalias: *a\n',
+    '\n# comment\ndue: 2025-02-15\n',
+    '\ndue: 2025-02-15\r\ntags:\r\n  - a\r\n',
+    ' trailing\ndue: 2025-02-15\n',
+    '\ndue: [unclosed\n',
+    '\n- just\n- a list\n',
+]
+
+
+def load(loader, text: str) -> str:
+    """Loader result (or 'error') as a type-exact string for comparison."""
+    try:
+        return repr(loader(text))
+    except (yaml.YAMLError, ValueError):
+        return 'error'
+
+
+@pytest.mark.parametrize('text', CORPUS)
+def test_matches_yaml_safe_load(text):
+    assert load(load_frontmatter_yaml, text) == load(yaml.safe_load, text)
@@ -0,0 +1,71 @@
+"""update_task_block must only ever change the managed block of a note."""
+
+import sys
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from task_utils import TASK_BLOCK_END, TASK_BLOCK_START, update_task_block
+
+TODAY = "## Overdue\n- [ ] [[a]] (due: 2026-10-12)\n\n## Due Today\n- [ ] [[b]]"
+STALE = "## Due Today\n- [ ] [[old]]"
+
+
+def block(task_content: str) -> str:
+    return f"{TASK_BLOCK_START}\n{task_content}\n{TASK_BLOCK_END}"
+
+
+def test_new_note_gets_block_under_heading():
+    assert update_task_block("# 2026-10-14\n\n## Tasks\n\n", TODAY) == (
+        f"# 2026-10-14\n\n## Tasks\n\n{block(TODAY)}\n\n"
+    )
+
+
+def test_missing_heading_is_appended():
+    assert update_task_block("# 2026-10-14\n\nHello\n", TODAY) == (
+        f"# 2026-10-14\n\nHello\n\n## Tasks\n\n{block(TODAY)}\n"
+    )
+
+
+def test_user_items_are_kept():
+    note = "# x\n\n## Tasks\n\n- [ ] [[call the plumber]]\n- [x] [[renew passport]]\n\n## Notes\nmine\n"
+    updated = update_task_block(note, TODAY)
+    assert updated == (
+        f"# x\n\n## Tasks\n\n{block(TODAY)}\n"
+        "\n- [ ] [[call the plumber]]\n- [x] [[renew passport]]\n\n## Notes\nmine\n"
+    )
+
+
+def test_legacy_copy_of_the_same_list_is_taken_over():
+    note = f"# x\n\n## Tasks\n\n{TODAY}\n\n## Notes\n"
+    assert update_task_block(note, TODAY) == f"# x\n\n## Tasks\n\n{block(TODAY)}\n\n## Notes\n"
+
+
+def test_stacked_legacy_lists_that_differ_are_kept():
+    note = f"# x\n\n## Tasks\n\n{TODAY}\n\n{STALE}\n\n## Notes\n"
+    assert update_task_block(note, TODAY) == f"# x\n\n## Tasks\n\n{block(TODAY)}\n\n{STALE}\n\n## Notes\n"
+
+    note = f"# x\n\n## Tasks\n\n{STALE}\n\n{STALE}\n"
+    assert update_task_block(note, TODAY) == f"# x\n\n## Tasks\n\n{block(TODAY)}\n\n{STALE}\n\n{STALE}\n"
+
+
+def test_rerun_is_unchanged():
+    note = "# x\n\n## Tasks\n\n- [ ] [[mine]]\n\n## Notes\nmine\n"
+    once = update_task_block(note, TODAY)
+    assert update_task_block(once, TODAY) == once
+
+
+def test_block_is_replaced_and_outside_kept():
+    note = f"# x\n\n## Tasks\n\nbefore\n{block(STALE)}\nafter\n"
+    assert update_task_block(note, TODAY) == f"# x\n\n## Tasks\n\nbefore\n{block(TODAY)}\nafter\n"
+
+
+def test_empty_list():
+    note = "# x\n\n## Tasks\n\n- [ ] [[mine]]\n"
+    assert update_task_block(note, '') == note
+
+    synced = update_task_block(note, TODAY)
+    emptied = update_task_block(synced, '')
+    assert emptied == f"# x\n\n## Tasks\n\n{TASK_BLOCK_START}\n{TASK_BLOCK_END}\n\n- [ ] [[mine]]\n"
+    assert update_task_block(emptied, '') == emptied